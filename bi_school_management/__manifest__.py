@@ -20,6 +20,8 @@
         "security/ir.model.access.csv",
         # Data
         "data/education_sequence.xml",
+        "data/education_grade_band_data.xml",
+        "data/education_invoice_job_data.xml",
         # Views
         "views/education_school_views.xml",
         "views/education_academic_year_views.xml",
@@ -29,10 +31,16 @@
         "views/education_student_views.xml",
         "views/education_enrollment_views.xml",
         "views/education_attendance_views.xml",
+        "views/education_attendance_daily_views.xml",
+        "views/education_enrollment_rollup_views.xml",
+        "views/education_grade_band_views.xml",
+        "views/education_invoice_job_views.xml",
         "views/res_partner_views.xml",
         "views/education_student_batch_create_wizard.xml",
         # Wizards
         "wizard/attendance_bulk_wizard.xml",
+        "wizard/grade_sheet_wizard.xml",
+        "wizard/graduation_wizard.xml",
         "wizard/course_enrollment_wizard.xml",
         "wizard/student_registration_wizard.xml",
         # Reports
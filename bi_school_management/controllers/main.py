@@ -1,19 +1,33 @@
-from odoo import http
+from odoo import _, http
+from odoo.http import request
 
-# class EducationContextDemo(http.Controller):
-#     @http.route('/bi_school_management/bi_school_management/', auth='public')
-#     def index(self, **kw):
-#         return "Hello, world"
 
-#     @http.route('/bi_school_management/bi_school_management/objects/', auth='public')
-#     def list(self, **kw):
-#         return http.request.render('bi_school_management.listing', {
-#             'root': '/bi_school_management/bi_school_management',
-#             'objects': http.request.env['bi_school_management.bi_school_management'].search([]),
-#         })
+class EducationAttendanceIngestController(http.Controller):
+    @http.route(
+        "/bi_school_management/attendance/events",
+        type="json",
+        auth="user",
+        methods=["POST"],
+    )
+    def ingest_attendance_events(self, events=None, **kw):
+        """Ingest a batch of check-in/check-out events from card readers.
 
-#     @http.route('/bi_school_management/bi_school_management/objects/<model("bi_school_management.bi_school_management"):obj>/', auth='public')
-#     def object(self, obj, **kw):
-#         return http.request.render('bi_school_management.object', {
-#             'object': obj
-#         })
+        Expects ``{"params": {"events": [{"student_code": ..., "event":
+        "check_in"|"check_out", "timestamp": "YYYY-MM-DD HH:MM:SS",
+        "class_id": ...}, ...]}}`` and returns the created/updated counts and
+        per-event errors.
+        """
+        if not isinstance(events, list):
+            return {"error": _("'events' must be a list.")}
+
+        max_events = int(
+            request.env["ir.config_parameter"]
+            .sudo()
+            .get_param("bi_school_management.attendance_ingest_max_events", 10000)
+        )
+        if len(events) > max_events:
+            return {
+                "error": _("Too many events in one request (maximum %d).") % max_events
+            }
+
+        return request.env["education.attendance"]._ingest_events(events)
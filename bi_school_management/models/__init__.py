@@ -1,11 +1,22 @@
+# Mixins first: models below inherit from them
+from . import education_seat_mixin, education_totals_mixin
 from . import (
+    account_account_extension,
+    account_journal_extension,
+    account_move_extension,
     education_academic_year,
     education_attendance,
+    education_attendance_archive,
+    education_attendance_daily,
     education_class,
     education_course,
     education_department,
     education_enrollment,
+    education_enrollment_rollup,
+    education_grade_band,
+    education_invoice_job,
     education_school,
     education_student,
+    product_template_extension,
     res_partner_extension,
 )
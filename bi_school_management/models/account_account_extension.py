@@ -0,0 +1,29 @@
+from odoo import api, models
+
+# Fields read by the enrollment invoicing income account lookup
+INVOICE_ACCOUNT_FIELDS = {"account_type", "company_ids", "deprecated", "active"}
+
+
+class AccountAccount(models.Model):
+    _inherit = "account.account"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        accounts = super().create(vals_list)
+        # Income accounts are cached per company for enrollment invoicing
+        if any(account.account_type == "income" for account in accounts):
+            self.env.registry.clear_cache()
+        return accounts
+
+    def write(self, vals):
+        result = super().write(vals)
+        if INVOICE_ACCOUNT_FIELDS.intersection(vals):
+            self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        income = any(account.account_type == "income" for account in self)
+        result = super().unlink()
+        if income:
+            self.env.registry.clear_cache()
+        return result
@@ -0,0 +1,29 @@
+from odoo import api, models
+
+# Fields read by the enrollment invoicing sale journal lookup
+INVOICE_JOURNAL_FIELDS = {"type", "company_id", "active", "sequence"}
+
+
+class AccountJournal(models.Model):
+    _inherit = "account.journal"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        journals = super().create(vals_list)
+        # Sale journals are cached per company for enrollment invoicing
+        if any(journal.type == "sale" for journal in journals):
+            self.env.registry.clear_cache()
+        return journals
+
+    def write(self, vals):
+        result = super().write(vals)
+        if INVOICE_JOURNAL_FIELDS.intersection(vals):
+            self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        sale = any(journal.type == "sale" for journal in self)
+        result = super().unlink()
+        if sale:
+            self.env.registry.clear_cache()
+        return result
@@ -0,0 +1,28 @@
+from odoo import models
+
+
+class AccountMove(models.Model):
+    _inherit = "account.move"
+
+    # Student fee totals follow invoice amounts and payments; the refresh is
+    # queued here and runs once per transaction (see education.student)
+    def _compute_amount(self):
+        super()._compute_amount()
+        self._schedule_student_fee_refresh()
+
+    def _compute_payment_state(self):
+        super()._compute_payment_state()
+        self._schedule_student_fee_refresh()
+
+    def unlink(self):
+        # Enrollments lose their invoice link on delete; resolve students now
+        enrollments = self.env["education.enrollment"].search(
+            [("invoice_id", "in", self.ids)]
+        )
+        enrollments._schedule_fee_refresh()
+        return super().unlink()
+
+    def _schedule_student_fee_refresh(self):
+        move_ids = [move_id for move_id in self._origin.ids if move_id]
+        if move_ids:
+            self.env["education.student"]._schedule_fee_refresh(move_ids=move_ids)
@@ -1,12 +1,14 @@
 from odoo import _, api, fields, models
 from odoo.exceptions import ValidationError
+from odoo.tools.sql import table_exists
 
 
 class EducationAcademicYear(models.Model):
     _name = "education.academic.year"
     _description = "Academic Year"
-    _inherit = ["mail.thread", "mail.activity.mixin"]
+    _inherit = ["mail.thread", "mail.activity.mixin", "education.totals.mixin"]
     _order = "start_date desc"
+    _totals_fields = ("total_classes", "total_students")
 
     name = fields.Char(string="Academic Year", required=True, tracking=True)
     code = fields.Char(string="Code", tracking=True)
@@ -33,13 +35,9 @@ class EducationAcademicYear(models.Model):
     # Relationships
     class_ids = fields.One2many("education.class", "academic_year_id", string="Classes")
 
-    # Computed Fields
-    total_classes = fields.Integer(
-        string="Total Classes", compute="_compute_totals", store=True
-    )
-    total_students = fields.Integer(
-        string="Total Students", compute="_compute_totals", store=True
-    )
+    # Totals, maintained by _refresh_totals
+    total_classes = fields.Integer(string="Total Classes", readonly=True, copy=False)
+    total_students = fields.Integer(string="Total Students", readonly=True, copy=False)
 
     # Multi-company support
     company_id = fields.Many2one(
@@ -64,11 +62,38 @@ class EducationAcademicYear(models.Model):
         ),
     ]
 
-    @api.depends("class_ids", "class_ids.student_ids")
-    def _compute_totals(self):
-        for year in self:
-            year.total_classes = len(year.class_ids)
-            year.total_students = len(year.class_ids.mapped("student_ids"))
+    # Totals
+    def _refresh_totals(self):
+        """Count active classes and their students per academic year (all
+        years when empty)"""
+        cr = self.env.cr
+        if not all(
+            table_exists(cr, table)
+            for table in ("education_class", "education_student")
+        ):
+            return
+        self.env["education.class"].flush_model(["academic_year_id", "active"])
+        self.env["education.student"].flush_model(["class_id"])
+        cr.execute(
+            """
+            UPDATE education_academic_year academic_year
+               SET total_classes = (
+                       SELECT COUNT(*) FROM education_class school_class
+                        WHERE school_class.academic_year_id = academic_year.id
+                          AND school_class.active
+                   ),
+                   total_students = (
+                       SELECT COUNT(*) FROM education_student student
+                         JOIN education_class school_class
+                           ON school_class.id = student.class_id
+                        WHERE school_class.academic_year_id = academic_year.id
+                          AND school_class.active
+                   )
+             WHERE %s OR academic_year.id = ANY(%s)
+            """,
+            (not self.ids, self.ids),
+        )
+        self.invalidate_model(self._totals_fields)
 
     # Workflow Methods
     def action_activate(self):
@@ -1,8 +1,13 @@
 import logging
+import threading
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta
 
 from odoo import _, api, fields, models
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
 
 _logger = logging.getLogger(__name__)
 
@@ -88,6 +93,35 @@ class EducationAttendance(models.Model):
         ),
     ]
 
+    # Fields that feed the enrollment counters and the daily roll-up
+    _COUNTER_FIELDS = {"enrollment_id", "class_id", "date", "state", "active"}
+
+    def _auto_init(self):
+        res = super()._auto_init()
+        # Roll lookups per class and day (wizards, duplicate checks)
+        create_index(
+            self._cr,
+            "education_attendance_class_id_date_index",
+            self._table,
+            ["class_id", "date"],
+        )
+        # "Latest attendance of a student before a date" lookups
+        create_index(
+            self._cr,
+            "education_attendance_student_id_date_index",
+            self._table,
+            ["student_id", "date"],
+        )
+        # Archival job: old rows that are still active
+        create_index(
+            self._cr,
+            "education_attendance_date_active_index",
+            self._table,
+            ["date"],
+            where="active",
+        )
+        return res
+
     @api.depends("check_in_time", "check_out_time")
     def _compute_duration(self):
         for attendance in self:
@@ -113,24 +147,406 @@ class EducationAttendance(models.Model):
             if attendance.date > fields.Date.context_today(attendance):
                 raise ValidationError(_("Attendance date cannot be in the future."))
 
+    # Override Methods
+    @api.model_create_multi
+    def create(self, vals_list):
+        attendances = super().create(vals_list)
+        attendances._apply_counter_deltas(attendances._get_counter_deltas(1))
+        return attendances
+
+    @api.model
+    def load(self, fields, data):
+        """Import attendance in bulk mode: no per-row tracking or chatter"""
+        result = super(
+            EducationAttendance, self.with_context(tracking_disable=True)
+        ).load(fields, data)
+        if result.get("ids"):
+            self.browse(result["ids"])._post_bulk_summary()
+        return result
+
+    def write(self, vals):
+        if not self._COUNTER_FIELDS.intersection(vals):
+            return super().write(vals)
+
+        deltas = self._get_counter_deltas(-1)
+        result = super().write(vals)
+        self._apply_counter_deltas(self._get_counter_deltas(1, deltas))
+        return result
+
+    def unlink(self):
+        deltas = self._get_counter_deltas(-1)
+        result = super().unlink()
+        self._apply_counter_deltas(deltas)
+        return result
+
+    # Bulk Mode Methods
+    @api.model
+    def _create_bulk(self, vals_list, post_summary=True):
+        """Create attendance without per-row tracking, followers or chatter.
+
+        One summary message per class and date is posted instead, unless
+        ``post_summary`` is False and the caller posts it itself.
+        """
+        attendances = self.with_context(tracking_disable=True).create(vals_list)
+        if post_summary:
+            attendances._post_bulk_summary()
+        return attendances.with_env(self.env)
+
+    def _write_bulk(self, vals):
+        """Write without per-row tracking; pair with ``_post_bulk_summary``"""
+        return self.with_context(tracking_disable=True).write(vals)
+
+    def _post_bulk_summary(self):
+        """Post one attendance summary per class and date on the class"""
+        state_labels = dict(self._fields["state"]._description_selection(self.env))
+        counts = defaultdict(lambda: defaultdict(int))
+        for attendance in self:
+            counts[attendance.class_id, attendance.date][attendance.state] += 1
+
+        for (school_class, date), state_counts in counts.items():
+            summary = ", ".join(
+                f"{state_counts[state]} {label.lower()}"
+                for state, label in state_labels.items()
+                if state_counts[state]
+            )
+            school_class.message_post(
+                body=_("Attendance recorded for %(date)s: %(summary)s.")
+                % {"date": date, "summary": summary},
+                message_type="notification",
+                subtype_xmlid="mail.mt_note",
+            )
+
+    # Ingestion Methods
+    @api.model
+    def _ingest_events(self, events):
+        """Upsert attendance from a batch of check-in/check-out events.
+
+        Each event is a dict with ``student_code`` (``education.student``
+        ``student_id``), ``event`` (``check_in`` or ``check_out``),
+        ``timestamp`` (UTC datetime string) and an optional ``class_id``
+        defaulting to the student's class. Student codes are resolved in one
+        query, missing rows are created in one batch and check-in/check-out
+        times of existing rows are updated with a single statement.
+
+        Returns a dict with ``created``, ``updated`` and per-event ``errors``;
+        malformed events are reported there rather than raised.
+        """
+        errors = []
+        valid = [isinstance(event, dict) for event in events]
+        codes = {
+            event["student_code"]
+            for event, ok in zip(events, valid)
+            if ok and isinstance(event.get("student_code"), str)
+        }
+        students = self.env["education.student"].search_fetch(
+            [("student_id", "in", list(codes))], ["student_id", "class_id"]
+        )
+        student_map = {student.student_id: student for student in students}
+        given_class_ids = {
+            event["class_id"]
+            for event, ok in zip(events, valid)
+            if ok and self._is_record_id(event.get("class_id"))
+        }
+        class_ids = set(
+            self.env["education.class"]
+            .search_fetch([("id", "in", list(given_class_ids))], [])
+            .ids
+        )
+
+        # (student_id, class_id, date) -> [check_in_time, check_out_time, indexes]
+        slots = {}
+        today = fields.Date.context_today(self)
+        for index, event in enumerate(events):
+            if not valid[index]:
+                errors.append({"index": index, "error": _("Malformed event.")})
+                continue
+            code = event.get("student_code")
+            student = student_map.get(code) if isinstance(code, str) else None
+            kind = event.get("event")
+            try:
+                timestamp = fields.Datetime.to_datetime(event.get("timestamp"))
+            except (TypeError, ValueError):
+                timestamp = None
+            class_id = event.get("class_id")
+            if class_id and not (
+                self._is_record_id(class_id) and class_id in class_ids
+            ):
+                errors.append({"index": index, "error": _("Unknown class.")})
+                continue
+            class_id = class_id or (student and student.class_id.id)
+            if not student:
+                errors.append({"index": index, "error": _("Unknown student code.")})
+            elif kind not in ("check_in", "check_out"):
+                errors.append({"index": index, "error": _("Unknown event type.")})
+            elif not timestamp:
+                errors.append({"index": index, "error": _("Invalid timestamp.")})
+            elif not class_id:
+                errors.append({"index": index, "error": _("Student has no class.")})
+            elif fields.Date.context_today(self, timestamp) > today:
+                errors.append(
+                    {"index": index, "error": _("Attendance date is in the future.")}
+                )
+            else:
+                date = fields.Date.context_today(self, timestamp)
+                slot = slots.setdefault((student.id, class_id, date), [None, None, []])
+                if kind == "check_in":
+                    slot[0] = min(slot[0] or timestamp, timestamp)
+                else:
+                    slot[1] = max(slot[1] or timestamp, timestamp)
+                slot[2].append(index)
+        if not slots:
+            return {"created": 0, "updated": 0, "errors": errors}
+
+        existing = {
+            (
+                attendance.student_id.id,
+                attendance.class_id.id,
+                attendance.date,
+            ): attendance
+            for attendance in self.with_context(active_test=False).search_fetch(
+                [
+                    ("student_id", "in", list({key[0] for key in slots})),
+                    ("class_id", "in", list({key[1] for key in slots})),
+                    ("date", "in", list({key[2] for key in slots})),
+                ],
+                ["student_id", "class_id", "date", "check_in_time", "check_out_time"],
+            )
+        }
+
+        to_create = []
+        to_update = []
+        for key, (check_in, check_out, indexes) in slots.items():
+            attendance = existing.get(key)
+            if attendance:
+                check_in = min(
+                    filter(None, (check_in, attendance.check_in_time)), default=None
+                )
+                check_out = max(
+                    filter(None, (check_out, attendance.check_out_time)), default=None
+                )
+            if check_in and check_out and check_out <= check_in:
+                errors.extend(
+                    {
+                        "index": index,
+                        "error": _("Check out time must be after check in time."),
+                    }
+                    for index in indexes
+                )
+            elif attendance:
+                if (check_in, check_out) != (
+                    attendance.check_in_time,
+                    attendance.check_out_time,
+                ):
+                    to_update.append((attendance.id, check_in, check_out))
+            else:
+                to_create.append(
+                    {
+                        "student_id": key[0],
+                        "class_id": key[1],
+                        "date": key[2],
+                        "state": "present",
+                        "check_in_time": check_in,
+                        "check_out_time": check_out,
+                    }
+                )
+
+        self._create_bulk(to_create)
+        if to_update:
+            self.browse([row[0] for row in to_update])._write_times(to_update)
+        return {"created": len(to_create), "updated": len(to_update), "errors": errors}
+
+    @api.model
+    def _is_record_id(self, value):
+        return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+    def _write_times(self, rows):
+        """Set check-in/check-out times and duration with a single UPDATE.
+
+        ``rows`` is a list of ``(id, check_in_time, check_out_time)``.
+        """
+        self.check_access("write")
+        self.flush_recordset(["check_in_time", "check_out_time", "duration"])
+        self.env.cr.execute(
+            SQL(
+                """
+                UPDATE education_attendance a
+                   SET check_in_time = v.check_in,
+                       check_out_time = v.check_out,
+                       duration = CASE
+                           WHEN v.check_in IS NOT NULL AND v.check_out IS NOT NULL
+                           THEN EXTRACT(EPOCH FROM v.check_out - v.check_in) / 3600.0
+                           ELSE 0.0
+                       END,
+                       write_uid = %s,
+                       write_date = now() AT TIME ZONE 'UTC'
+                  FROM (VALUES %s) AS v(id, check_in, check_out)
+                 WHERE a.id = v.id
+                """,
+                self.env.uid,
+                SQL(", ").join(
+                    SQL("(%s, %s::timestamp, %s::timestamp)", *row) for row in rows
+                ),
+            )
+        )
+        self.invalidate_recordset(
+            ["check_in_time", "check_out_time", "duration", "write_uid", "write_date"]
+        )
+
+    @api.model
+    def _get_last_attendance_before(self, student_ids, date):
+        """Return ``{student_id: (date, state)}`` of the latest active
+        attendance strictly before ``date``, for all students in one query"""
+        if not student_ids:
+            return {}
+        self.flush_model(["student_id", "date", "state", "active"])
+        self.env.cr.execute(
+            """
+            SELECT s.student_id, a.date, a.state
+              FROM unnest(%s::int[]) AS s(student_id)
+      CROSS JOIN LATERAL (
+                    SELECT date, state
+                      FROM education_attendance
+                     WHERE student_id = s.student_id
+                       AND date < %s
+                       AND active
+                  ORDER BY date DESC, id DESC
+                     LIMIT 1
+                 ) a
+            """,
+            (list(student_ids), date),
+        )
+        return {
+            student_id: (last_date, state)
+            for student_id, last_date, state in self.env.cr.fetchall()
+        }
+
+    # Counter Methods
+    def _get_counter_deltas(self, sign, deltas=None):
+        """Add the contribution of these rows, times ``sign``, to ``deltas``.
+
+        Returns ``(enrollment_deltas, daily_deltas)`` where the first maps an
+        enrollment id to ``[total, attended]`` and the second maps a
+        ``(class_id, date)`` pair to per-state counts. Archived rows are not
+        counted.
+        """
+        enrollment_deltas, daily_deltas = deltas or (
+            defaultdict(lambda: [0, 0]),
+            defaultdict(lambda: defaultdict(int)),
+        )
+        for attendance in self:
+            if not attendance.active:
+                continue
+            if attendance.enrollment_id:
+                delta = enrollment_deltas[attendance.enrollment_id.id]
+                delta[0] += sign
+                if attendance.state == "present":
+                    delta[1] += sign
+            daily_deltas[attendance.class_id.id, attendance.date][
+                attendance.state
+            ] += sign
+        return enrollment_deltas, daily_deltas
+
+    def _apply_counter_deltas(self, deltas):
+        enrollment_deltas, daily_deltas = deltas
+        self.env["education.enrollment"]._apply_attendance_deltas(enrollment_deltas)
+        self.env["education.attendance.daily"]._apply_attendance_deltas(daily_deltas)
+
     @api.autovacuum
     def _archive_old_attendance(self):
-        """Archive attendance records older than 2 years (autovacuum daily)."""
-        cutoff_date = fields.Date.to_string(datetime.now().date() - timedelta(days=90))
-        old_attendance = self.search(
-            [("date", "<", cutoff_date), ("active", "=", True)]
+        """Archive attendance records older than 90 days (autovacuum daily)."""
+        self._run_attendance_archival()
+
+    @api.model
+    def _run_attendance_archival(
+        self, cutoff_date=None, batch_size=None, time_budget=None, auto_commit=None
+    ):
+        """Archive old attendance in bounded chunks within a time budget.
+
+        Each chunk is committed on its own, so an interrupted or timed-out run
+        loses at most one chunk and the next run simply picks up the remaining
+        rows. When the ``bi_school_management.attendance_archive_mode`` system
+        parameter is ``move``, rows are moved to ``education.attendance.archive``
+        instead of being flagged inactive.
+        """
+        ICP = self.env["ir.config_parameter"].sudo()
+        if cutoff_date is None:
+            cutoff_date = datetime.now().date() - timedelta(days=90)
+        if batch_size is None:
+            batch_size = int(
+                ICP.get_param(
+                    "bi_school_management.attendance_archive_batch_size", 5000
+                )
+            )
+        if time_budget is None:
+            time_budget = float(
+                ICP.get_param(
+                    "bi_school_management.attendance_archive_time_budget", 300
+                )
+            )
+        if auto_commit is None:
+            auto_commit = not getattr(threading.current_thread(), "testing", False)
+        move = (
+            ICP.get_param("bi_school_management.attendance_archive_mode", "archive")
+            == "move"
         )
-        if old_attendance:
-            _logger.info(
-                "Autovacuum: Archiving %d old attendance records", len(old_attendance)
+
+        started = time.monotonic()
+        processed = 0
+        finished = False
+        while time.monotonic() - started < time_budget:
+            chunk = self.search(
+                [("date", "<", cutoff_date), ("active", "=", True)],
+                order="date, id",
+                limit=batch_size,
             )
-            old_attendance.write({"active": False})
-        else:
-            _logger.info("Autovacuum: No old attendance records to archive.")
-
-    @api.ondelete(at_uninstall=False)
-    def _unlink_if_has_students(self):
-        """Prevent deleting classes that have students assigned."""
-        for class_rec in self:
-            if class_rec.student_ids:
-                pass
+            if not chunk:
+                finished = True
+                break
+            if move:
+                chunk._move_to_archive()
+            else:
+                chunk.with_context(tracking_disable=True).write({"active": False})
+            processed += len(chunk)
+            if auto_commit:
+                self.env.cr.commit()
+            self.env.invalidate_all()
+
+        elapsed = time.monotonic() - started
+        rate = processed / elapsed if elapsed else 0.0
+        _logger.info(
+            "Autovacuum: %s %d old attendance records in %.1fs (%.0f rows/s)%s",
+            "moved" if move else "archived",
+            processed,
+            elapsed,
+            rate,
+            "" if finished else ", time budget exhausted, will resume next run",
+        )
+        return {
+            "processed": processed,
+            "seconds": elapsed,
+            "rows_per_second": rate,
+            "finished": finished,
+        }
+
+    def _move_to_archive(self):
+        """Copy these rows to the cold archive table, then delete them"""
+        self.flush_recordset()
+        self.env.cr.execute(
+            """
+            INSERT INTO education_attendance_archive (
+                attendance_id, student_id, class_id, enrollment_id, course_id,
+                department_id, academic_year_id, teacher_id, company_id, date,
+                state, notes, check_in_time, check_out_time, duration,
+                archived_on, create_uid, create_date, write_uid, write_date
+            )
+            SELECT id, student_id, class_id, enrollment_id, course_id,
+                   department_id, academic_year_id, teacher_id, company_id, date,
+                   state, notes, check_in_time, check_out_time, duration,
+                   now() AT TIME ZONE 'UTC', %s, now() AT TIME ZONE 'UTC',
+                   %s, now() AT TIME ZONE 'UTC'
+              FROM education_attendance
+             WHERE id = ANY(%s)
+            """,
+            (self.env.uid, self.env.uid, self.ids),
+        )
+        self.with_context(tracking_disable=True).unlink()
@@ -0,0 +1,40 @@
+from odoo import fields, models
+
+
+class EducationAttendanceArchive(models.Model):
+    _name = "education.attendance.archive"
+    _description = "Archived Education Attendance"
+    _order = "date desc, id desc"
+
+    # Cold copy of education.attendance rows moved out by the archival job
+    attendance_id = fields.Integer(string="Original Attendance ID", readonly=True)
+    student_id = fields.Many2one("education.student", string="Student", readonly=True)
+    class_id = fields.Many2one("education.class", string="Class", readonly=True)
+    enrollment_id = fields.Many2one(
+        "education.enrollment", string="Enrollment", readonly=True
+    )
+    course_id = fields.Many2one("education.course", string="Course", readonly=True)
+    department_id = fields.Many2one(
+        "education.department", string="Department", readonly=True
+    )
+    academic_year_id = fields.Many2one(
+        "education.academic.year", string="Academic Year", readonly=True
+    )
+    teacher_id = fields.Many2one("hr.employee", string="Teacher", readonly=True)
+    company_id = fields.Many2one("res.company", string="Company", readonly=True)
+    date = fields.Date(string="Attendance Date", readonly=True, index=True)
+    state = fields.Selection(
+        [
+            ("present", "Present"),
+            ("absent", "Absent"),
+            ("late", "Late"),
+            ("excused", "Excused Absence"),
+        ],
+        string="State",
+        readonly=True,
+    )
+    notes = fields.Text(string="Notes", readonly=True)
+    check_in_time = fields.Datetime(string="Check In Time", readonly=True)
+    check_out_time = fields.Datetime(string="Check Out Time", readonly=True)
+    duration = fields.Float(string="Duration (Hours)", readonly=True)
+    archived_on = fields.Datetime(string="Archived On", readonly=True)
@@ -0,0 +1,218 @@
+import logging
+
+from odoo import api, fields, models
+from odoo.tools.sql import table_exists
+
+_logger = logging.getLogger(__name__)
+
+# Attendance state -> roll-up column
+STATE_COLUMNS = {
+    "present": "present_count",
+    "absent": "absent_count",
+    "late": "late_count",
+    "excused": "excused_count",
+}
+
+
+class EducationAttendanceDaily(models.Model):
+    _name = "education.attendance.daily"
+    _description = "Daily Attendance Summary"
+    _order = "date desc, class_id"
+    _rec_name = "class_id"
+
+    # Per class and date counts, maintained incrementally by
+    # education.attendance create/write/unlink
+    class_id = fields.Many2one(
+        "education.class",
+        string="Class",
+        required=True,
+        readonly=True,
+        ondelete="cascade",
+    )
+    date = fields.Date(string="Date", required=True, readonly=True)
+    department_id = fields.Many2one(
+        "education.department", string="Department", readonly=True
+    )
+    academic_year_id = fields.Many2one(
+        "education.academic.year", string="Academic Year", readonly=True
+    )
+    company_id = fields.Many2one("res.company", string="Company", readonly=True)
+
+    present_count = fields.Integer(string="Present", readonly=True, default=0)
+    absent_count = fields.Integer(string="Absent", readonly=True, default=0)
+    late_count = fields.Integer(string="Late", readonly=True, default=0)
+    excused_count = fields.Integer(string="Excused", readonly=True, default=0)
+    total_count = fields.Integer(string="Total", readonly=True, default=0)
+    attendance_rate = fields.Float(
+        string="Attendance %", readonly=True, aggregator="avg"
+    )
+
+    _sql_constraints = [
+        (
+            "class_date_unique",
+            "unique(class_id, date)",
+            "Only one daily summary per class and date!",
+        ),
+    ]
+
+    @api.model
+    def read_group(
+        self, domain, fields, groupby, offset=0, limit=None, orderby=False, lazy=True
+    ):
+        """Report the attendance rate of a group as its present/total ratio,
+        not as the unweighted mean of its per-class daily rates"""
+        fnames = {spec.split(":")[0] for spec in fields}
+        if "attendance_rate" not in fnames:
+            return super().read_group(
+                domain, fields, groupby, offset, limit, orderby, lazy
+            )
+        fields = [spec for spec in fields if spec.split(":")[0] != "attendance_rate"]
+        fields += [
+            f"{fname}:sum"
+            for fname in ("present_count", "total_count")
+            if fname not in fnames
+        ]
+        groups = super().read_group(
+            domain, fields, groupby, offset, limit, orderby, lazy
+        )
+        for group in groups:
+            total = group.get("total_count") or 0
+            group["attendance_rate"] = (
+                100.0 * (group.get("present_count") or 0) / total if total else 0.0
+            )
+        return groups
+
+    def init(self):
+        # Seed the roll-up from existing attendance on first install
+        if not table_exists(self.env.cr, "education_attendance"):
+            return
+        self.env.cr.execute("SELECT 1 FROM education_attendance_daily LIMIT 1")
+        if not self.env.cr.fetchone():
+            self._rebuild()
+
+    @api.model
+    def _apply_attendance_deltas(self, deltas):
+        """Apply ``{(class_id, date): {state: count}}`` deltas with upserts"""
+        self.env["education.class"].flush_model(
+            ["department_id", "academic_year_id", "company_id"]
+        )
+        touched = []
+        for (class_id, date), state_counts in deltas.items():
+            total = sum(state_counts.values())
+            counts = {
+                column: state_counts.get(state, 0)
+                for state, column in STATE_COLUMNS.items()
+            }
+            if not total and not any(counts.values()):
+                continue
+            self.env.cr.execute(
+                """
+                INSERT INTO education_attendance_daily (
+                    class_id, date, department_id, academic_year_id, company_id,
+                    present_count, absent_count, late_count, excused_count,
+                    total_count, attendance_rate,
+                    create_uid, create_date, write_uid, write_date
+                )
+                SELECT c.id, %(date)s, c.department_id, c.academic_year_id,
+                       c.company_id, %(present_count)s, %(absent_count)s,
+                       %(late_count)s, %(excused_count)s, %(total)s,
+                       CASE WHEN %(total)s > 0
+                            THEN 100.0 * %(present_count)s / %(total)s
+                            ELSE 0.0 END,
+                       %(uid)s, now() AT TIME ZONE 'UTC',
+                       %(uid)s, now() AT TIME ZONE 'UTC'
+                  FROM education_class c
+                 WHERE c.id = %(class_id)s
+                ON CONFLICT (class_id, date) DO UPDATE SET
+                    present_count = education_attendance_daily.present_count
+                                    + EXCLUDED.present_count,
+                    absent_count = education_attendance_daily.absent_count
+                                   + EXCLUDED.absent_count,
+                    late_count = education_attendance_daily.late_count
+                                 + EXCLUDED.late_count,
+                    excused_count = education_attendance_daily.excused_count
+                                    + EXCLUDED.excused_count,
+                    total_count = education_attendance_daily.total_count
+                                  + EXCLUDED.total_count,
+                    attendance_rate = CASE
+                        WHEN education_attendance_daily.total_count
+                             + EXCLUDED.total_count > 0
+                        THEN 100.0 * (education_attendance_daily.present_count
+                                      + EXCLUDED.present_count)
+                             / (education_attendance_daily.total_count
+                                + EXCLUDED.total_count)
+                        ELSE 0.0 END,
+                    write_uid = EXCLUDED.write_uid,
+                    write_date = EXCLUDED.write_date
+                RETURNING id
+                """,
+                dict(
+                    counts,
+                    class_id=class_id,
+                    date=date,
+                    total=total,
+                    uid=self.env.uid,
+                ),
+            )
+            touched.extend(row[0] for row in self.env.cr.fetchall())
+
+        if touched:
+            self.env.cr.execute(
+                """
+                DELETE FROM education_attendance_daily
+                 WHERE id = ANY(%s) AND total_count <= 0
+                """,
+                (touched,),
+            )
+            self.invalidate_model()
+
+    @api.model
+    def _sync_class_fields(self, classes):
+        """Propagate department/year/company changes of ``classes``"""
+        classes.flush_recordset(["department_id", "academic_year_id", "company_id"])
+        self.env.cr.execute(
+            """
+            UPDATE education_attendance_daily d
+               SET department_id = c.department_id,
+                   academic_year_id = c.academic_year_id,
+                   company_id = c.company_id
+              FROM education_class c
+             WHERE d.class_id = c.id AND c.id = ANY(%s)
+            """,
+            (classes.ids,),
+        )
+        self.invalidate_model(["department_id", "academic_year_id", "company_id"])
+
+    @api.model
+    def _rebuild(self):
+        """Recompute the whole roll-up from education_attendance"""
+        self.env["education.attendance"].flush_model()
+        self.env.cr.execute("DELETE FROM education_attendance_daily")
+        self.env.cr.execute(
+            """
+            INSERT INTO education_attendance_daily (
+                class_id, date, department_id, academic_year_id, company_id,
+                present_count, absent_count, late_count, excused_count,
+                total_count, attendance_rate,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT a.class_id, a.date, c.department_id, c.academic_year_id,
+                   c.company_id,
+                   COUNT(*) FILTER (WHERE a.state = 'present'),
+                   COUNT(*) FILTER (WHERE a.state = 'absent'),
+                   COUNT(*) FILTER (WHERE a.state = 'late'),
+                   COUNT(*) FILTER (WHERE a.state = 'excused'),
+                   COUNT(*),
+                   100.0 * COUNT(*) FILTER (WHERE a.state = 'present') / COUNT(*),
+                   %(uid)s, now() AT TIME ZONE 'UTC',
+                   %(uid)s, now() AT TIME ZONE 'UTC'
+              FROM education_attendance a
+              JOIN education_class c ON c.id = a.class_id
+             WHERE a.active
+          GROUP BY a.class_id, a.date, c.department_id, c.academic_year_id,
+                   c.company_id
+            """,
+            {"uid": self.env.uid},
+        )
+        _logger.info("Rebuilt %d daily attendance summaries", self.env.cr.rowcount)
+        self.invalidate_model()
@@ -1,10 +1,23 @@
 from odoo import _, api, fields, models
+from odoo.tools.sql import table_exists
+
+from .education_enrollment_rollup import GENDER_SELECTION
+from .education_student import STUDENT_STATE_SELECTION
 
 
 class EducationClass(models.Model):
     _name = "education.class"
     _description = "Education Class"
-    _inherit = ["mail.thread", "mail.activity.mixin"]
+    _inherit = [
+        "mail.thread",
+        "mail.activity.mixin",
+        "education.seat.mixin",
+        "education.totals.mixin",
+    ]
+
+    _seat_holder_model = "education.student"
+    _seat_holder_field = "class_id"
+    _totals_fields = ("total_students", "available_capacity")
 
     name = fields.Char(string="Class Name", required=True, tracking=True)
     code = fields.Char(string="Class Code", tracking=True)
@@ -23,10 +36,10 @@ class EducationClass(models.Model):
     student_ids = fields.One2many("education.student", "class_id", string="Students")
     course_ids = fields.Many2many("education.course", string="Courses")
 
-    # Computed Fields
-    total_students = fields.Integer(compute="_compute_totals", store=True)
+    # Totals, maintained by _refresh_totals
+    total_students = fields.Integer(readonly=True, copy=False)
     available_capacity = fields.Integer(
-        string="Available Capacity", compute="_compute_totals", store=True
+        string="Available Capacity", readonly=True, copy=False
     )
 
     # Multi-company support
@@ -47,16 +60,66 @@ class EducationClass(models.Model):
         help="Filter students by this gender. Not required.",
     )
 
-    @api.depends("student_ids", "capacity")
-    def _compute_totals(self):
-        for class_rec in self:
-            class_rec.total_students = len(class_rec.student_ids)
-            if class_rec.capacity:
-                class_rec.available_capacity = (
-                    class_rec.capacity - class_rec.total_students
-                )
-            else:
-                class_rec.available_capacity = 0
+    # Totals
+    def _refresh_totals(self):
+        """Count students per class (all classes when empty)"""
+        if not table_exists(self.env.cr, "education_student"):
+            return
+        self.env["education.student"].flush_model(["class_id"])
+        self.flush_model(["capacity"])
+        self.env.cr.execute(
+            """
+            UPDATE education_class school_class
+               SET total_students = counts.total,
+                   available_capacity = CASE
+                       WHEN COALESCE(school_class.capacity, 0) != 0
+                       THEN school_class.capacity - counts.total
+                       ELSE 0
+                   END
+              FROM (
+                    SELECT target.id, COUNT(student.id) AS total
+                      FROM education_class target
+                 LEFT JOIN education_student student
+                        ON student.class_id = target.id
+                     WHERE %s OR target.id = ANY(%s)
+                  GROUP BY target.id
+                   ) counts
+             WHERE school_class.id = counts.id
+            """,
+            (not self.ids, self.ids),
+        )
+        self.invalidate_model(self._totals_fields)
+
+    def _schedule_parent_totals_refresh(self):
+        """Queue the departments, schools and years of these classes"""
+        self.department_id._schedule_totals_refresh()
+        self.department_id.school_id._schedule_totals_refresh()
+        self.academic_year_id._schedule_totals_refresh()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        classes = super().create(vals_list)
+        classes._schedule_totals_refresh()
+        classes._schedule_parent_totals_refresh()
+        return classes
+
+    def write(self, vals):
+        moved = bool({"department_id", "academic_year_id", "active"}.intersection(vals))
+        if moved:
+            self._schedule_parent_totals_refresh()
+        result = super().write(vals)
+        if {"department_id", "academic_year_id", "company_id"}.intersection(vals):
+            self.env["education.attendance.daily"]._sync_class_fields(self)
+            self.env["education.enrollment.rollup"]._sync_class_fields(self)
+        if moved:
+            self._schedule_parent_totals_refresh()
+        if "capacity" in vals:
+            self._schedule_totals_refresh()
+        return result
+
+    def unlink(self):
+        self._schedule_parent_totals_refresh()
+        return super().unlink()
 
     def action_view_students(self):
         return {
@@ -81,6 +144,15 @@ class EducationClass(models.Model):
             },
         }
 
+    def action_view_attendance_summary(self):
+        return {
+            "name": "Daily Attendance",
+            "view_mode": "list,pivot,graph",
+            "res_model": "education.attendance.daily",
+            "type": "ir.actions.act_window",
+            "domain": [("class_id", "=", self.id)],
+        }
+
     def action_course_enrollments(self):
         return {
             "name": "Course Enrollments",
@@ -127,12 +199,79 @@ class EducationClass(models.Model):
 
     @api.readonly
     def get_student_statistics(self):
-        """Return statistics about students in this class (readonly)."""
+        """Return statistics about students in these classes (readonly)."""
+        self.check_access("read")
+        stats = self._get_class_statistics()
+        return {
+            key: sum(class_stats[key] for class_stats in stats.values())
+            for key in ("total", "enrolled", "graduated")
+        }
+
+    @api.model
+    def get_class_statistics(self, class_ids=None, academic_year_id=None):
+        """Return the student statistics of many classes in one call.
+
+        Covers the given ``class_ids``, or every class of
+        ``academic_year_id``. Returns one dict per class with the ``total``,
+        a count per student state, the ``gender`` split and the capacity use.
+        """
+        if class_ids is None:
+            domain = (
+                [("academic_year_id", "=", academic_year_id)]
+                if academic_year_id
+                else []
+            )
+            class_ids = self.search(domain).ids
+        classes = self.browse(class_ids)
+        classes.check_access("read")
+        stats = classes._get_class_statistics()
+        return [
+            dict(stats[class_id], class_id=class_id)
+            for class_id in class_ids
+            if class_id in stats
+        ]
+
+    def _get_class_statistics(self):
+        """Return ``{class_id: statistics}`` from one grouped read.
+
+        The counts come from the headcount rollup, which acts as a per-class
+        cache: it is updated only when a student's class, state or gender
+        changes. They are aggregates over classes the caller may read, so
+        ``education.student`` record rules are deliberately not applied to
+        the counted students (the rollup is read as superuser).
+        """
+        states = [state for state, __ in STUDENT_STATE_SELECTION]
+        genders = [gender for gender, __ in GENDER_SELECTION]
+        classes = self.exists()
         stats = {
-            "total": len(self.student_ids),
-            "enrolled": len(self.student_ids.filtered(lambda s: s.state == "enrolled")),
-            "graduated": len(
-                self.student_ids.filtered(lambda s: s.state == "graduated")
-            ),
+            school_class.id: dict(
+                dict.fromkeys(states, 0),
+                total=0,
+                gender=dict.fromkeys(genders, 0),
+            )
+            for school_class in classes
         }
+        for school_class, state, gender, count in (
+            self.env["education.enrollment.rollup"]
+            .sudo()
+            ._read_group(
+                [("class_id", "in", classes.ids)],
+                groupby=["class_id", "state", "gender"],
+                aggregates=["student_count:sum"],
+            )
+        ):
+            class_stats = stats[school_class.id]
+            class_stats[state] += count
+            class_stats["gender"][gender] += count
+            class_stats["total"] += count
+
+        for school_class in classes:
+            class_stats = stats[school_class.id]
+            capacity = school_class.capacity
+            total = class_stats["total"]
+            class_stats.update(
+                capacity=capacity,
+                available=capacity - total if capacity else 0,
+                capacity_used=round(100.0 * total / capacity, 2) if capacity else 0.0,
+            )
         return stats
@@ -1,10 +1,15 @@
-from odoo import _, api, fields, models
+from odoo import _, api, fields, models, tools
+from odoo.exceptions import ValidationError
+from odoo.tools import frozendict
 
 
 class EducationCourse(models.Model):
     _name = "education.course"
     _description = "Education Course"
-    _inherit = ["mail.thread", "mail.activity.mixin"]
+    _inherit = ["mail.thread", "mail.activity.mixin", "education.seat.mixin"]
+
+    _seat_holder_model = "education.enrollment"
+    _seat_holder_field = "course_id"
 
     name = fields.Char(string="Course Name", required=True, tracking=True)
     code = fields.Char(string="Course Code", tracking=True)
@@ -59,7 +64,7 @@ class EducationCourse(models.Model):
         string="Active Enrollments", compute="_compute_totals", store=True
     )
     available_capacity = fields.Integer(
-        string="Available Capacity", compute="_compute_totals", store=True
+        string="Available Capacity", compute="_compute_available_capacity", store=True
     )
 
     # Multi-company support
@@ -72,14 +77,98 @@ class EducationCourse(models.Model):
     start_date = fields.Date(string="Start Date")
     end_date = fields.Date(string="End Date")
 
-    @api.depends("enrollment_ids", "enrollment_ids.state", "capacity")
+    @api.depends("enrollment_ids", "enrollment_ids.state")
     def _compute_totals(self):
         for course in self:
             course.total_enrollments = len(course.enrollment_ids)
             course.active_enrollments = len(
                 course.enrollment_ids.filtered(lambda e: e.state == "enrolled")
             )
+
+    @api.depends("seats_taken", "capacity")
+    def _compute_available_capacity(self):
+        # Confirmed enrollments hold a seat too, see education.seat.mixin
+        for course in self:
             if course.capacity:
-                course.available_capacity = course.capacity - course.active_enrollments
+                course.available_capacity = course.capacity - course.seats_taken
             else:
                 course.available_capacity = 0
+
+    @api.constrains("prerequisite_ids")
+    def _check_prerequisite_cycle(self):
+        if self._has_cycle("prerequisite_ids"):
+            raise ValidationError(_("Course prerequisites cannot form a cycle."))
+
+    # Actions
+    def action_import_grade_sheet(self):
+        self.ensure_one()
+        action = self.env["ir.actions.act_window"]._for_xml_id(
+            "bi_school_management.action_education_grade_sheet_wizard"
+        )
+        action["context"] = {"default_course_id": self.id}
+        return action
+
+    # Prerequisite Closure
+    @api.model
+    @tools.ormcache("department_id")
+    def _get_prerequisite_closure(self, department_id):
+        """Return ``{course_id: frozenset(all transitive prerequisite ids)}``
+        for the courses of a department, computed with one recursive query.
+
+        Cached per department; cleared only when prerequisites or course
+        departments change.
+        """
+        self.flush_model(["prerequisite_ids", "department_id"])
+        self.env.cr.execute(
+            """
+            WITH RECURSIVE closure(course_id, prerequisite_id) AS (
+                SELECT rel.course_id, rel.prerequisite_id
+                  FROM course_prerequisite_rel rel
+                  JOIN education_course course ON course.id = rel.course_id
+                 WHERE course.department_id = %s
+                 UNION
+                SELECT closure.course_id, rel.prerequisite_id
+                  FROM closure
+                  JOIN course_prerequisite_rel rel
+                    ON rel.course_id = closure.prerequisite_id
+            )
+            SELECT course_id, array_agg(prerequisite_id)
+              FROM closure
+          GROUP BY course_id
+            """,
+            (department_id,),
+        )
+        return frozendict(
+            (course_id, frozenset(prerequisite_ids))
+            for course_id, prerequisite_ids in self.env.cr.fetchall()
+        )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        courses = super().create(vals_list)
+        if any(vals.get("prerequisite_ids") for vals in vals_list):
+            self.env.registry.clear_cache()
+        courses.department_id._schedule_totals_refresh()
+        return courses
+
+    def write(self, vals):
+        moved = bool({"department_id", "active"}.intersection(vals))
+        if moved:
+            self.department_id._schedule_totals_refresh()
+        result = super().write(vals)
+        if {"prerequisite_ids", "department_id"}.intersection(vals):
+            self.env.registry.clear_cache()
+        if moved:
+            self.department_id._schedule_totals_refresh()
+        return result
+
+    def unlink(self):
+        self.department_id._schedule_totals_refresh()
+        # Deleting a course only changes closures it takes part in
+        linked = self.prerequisite_ids or self.search_count(
+            [("prerequisite_ids", "in", self.ids)], limit=1
+        )
+        result = super().unlink()
+        if linked:
+            self.env.registry.clear_cache()
+        return result
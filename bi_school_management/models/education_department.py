@@ -1,10 +1,12 @@
 from odoo import _, api, fields, models
+from odoo.tools.sql import table_exists
 
 
 class EducationDepartment(models.Model):
     _name = "education.department"
     _description = "Education Department"
-    _inherit = ["mail.thread", "mail.activity.mixin"]
+    _inherit = ["mail.thread", "mail.activity.mixin", "education.totals.mixin"]
+    _totals_fields = ("total_courses", "total_classes", "total_students")
 
     name = fields.Char(string="Department Name", required=True, tracking=True)
     code = fields.Char(string="Department Code", tracking=True)
@@ -25,16 +27,10 @@ class EducationDepartment(models.Model):
         "education.student", "department_id", string="Students"
     )
 
-    # Computed Fields
-    total_courses = fields.Integer(
-        string="Total Courses", compute="_compute_totals", store=True
-    )
-    total_classes = fields.Integer(
-        string="Total Classes", compute="_compute_totals", store=True
-    )
-    total_students = fields.Integer(
-        string="Total Students", compute="_compute_totals", store=True
-    )
+    # Totals, maintained by _refresh_totals
+    total_courses = fields.Integer(string="Total Courses", readonly=True, copy=False)
+    total_classes = fields.Integer(string="Total Classes", readonly=True, copy=False)
+    total_students = fields.Integer(string="Total Students", readonly=True, copy=False)
 
     # Multi-company support
     company_id = fields.Many2one(
@@ -45,9 +41,63 @@ class EducationDepartment(models.Model):
     description = fields.Text(string="Description")
     active = fields.Boolean(string="Active", default=True)
 
-    @api.depends("course_ids", "class_ids", "student_ids")
-    def _compute_totals(self):
-        for department in self:
-            department.total_courses = len(department.course_ids)
-            department.total_classes = len(department.class_ids)
-            department.total_students = len(department.student_ids)
+    # Totals
+    def _refresh_totals(self):
+        """Count active courses and classes, and students, per department
+        (all departments when empty)"""
+        cr = self.env.cr
+        if not all(
+            table_exists(cr, table)
+            for table in ("education_course", "education_class", "education_student")
+        ):
+            return
+        self.env["education.course"].flush_model(["department_id", "active"])
+        self.env["education.class"].flush_model(["department_id", "active"])
+        self.env["education.student"].flush_model(["department_id"])
+        cr.execute(
+            """
+            UPDATE education_department department
+               SET total_courses = (
+                       SELECT COUNT(*) FROM education_course course
+                        WHERE course.department_id = department.id
+                          AND course.active
+                   ),
+                   total_classes = (
+                       SELECT COUNT(*) FROM education_class school_class
+                        WHERE school_class.department_id = department.id
+                          AND school_class.active
+                   ),
+                   total_students = (
+                       SELECT COUNT(*) FROM education_student student
+                        WHERE student.department_id = department.id
+                   )
+             WHERE %s OR department.id = ANY(%s)
+            """,
+            (not self.ids, self.ids),
+        )
+        self.invalidate_model(self._totals_fields)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        departments = super().create(vals_list)
+        departments._schedule_totals_refresh()
+        departments.school_id._schedule_totals_refresh()
+        return departments
+
+    def write(self, vals):
+        moved = bool({"school_id", "active"}.intersection(vals))
+        if moved:
+            self.school_id._schedule_totals_refresh()
+        result = super().write(vals)
+        if moved:
+            self.school_id._schedule_totals_refresh()
+        if {"school_id", "company_id"}.intersection(vals):
+            classes = self.with_context(active_test=False).class_ids
+            self.env["education.enrollment.rollup"]._sync_class_fields(classes)
+            if "company_id" in vals:
+                self.env["education.attendance.daily"]._sync_class_fields(classes)
+        return result
+
+    def unlink(self):
+        self.school_id._schedule_totals_refresh()
+        return super().unlink()
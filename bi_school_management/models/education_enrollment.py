@@ -1,5 +1,27 @@
-from odoo import _, api, fields, models
+import logging
+from collections import Counter, defaultdict
+
+from odoo import _, api, fields, models, tools
 from odoo.exceptions import UserError, ValidationError
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+
+_logger = logging.getLogger(__name__)
+
+# Call/miss counters of the invoice resolution cache, per worker process and
+# database
+INVOICE_CACHE_STATS = defaultdict(Counter)
+
+GRADE_SELECTION = [
+    ("a+", "A+"),
+    ("a", "A"),
+    ("b+", "B+"),
+    ("b", "B"),
+    ("c+", "C+"),
+    ("c", "C"),
+    ("d", "D"),
+    ("f", "F"),
+]
 
 
 class EducationEnrollment(models.Model):
@@ -8,6 +30,17 @@ class EducationEnrollment(models.Model):
     _inherit = ["mail.thread", "mail.activity.mixin"]
     _order = "enrollment_date desc, id desc"
 
+    # States holding a seat in the course
+    _SEAT_STATES = ("confirmed", "enrolled")
+    # Transition name: (failure check, grouped write) used by batch_transition
+    _BATCH_TRANSITIONS = {
+        "confirm": ("_get_confirm_failures", "_run_confirm"),
+        "enroll": ("_get_enroll_failures", "_run_enroll"),
+        "complete": ("_get_complete_failures", "_run_complete"),
+        "cancel": ("_get_cancel_failures", "_run_cancel"),
+        "fail": ("_get_fail_failures", "_run_fail"),
+    }
+
     # Basic Information
     student_id = fields.Many2one(
         "education.student", string="Student", required=True, tracking=True
@@ -47,19 +80,7 @@ class EducationEnrollment(models.Model):
     )
 
     # Academic Information
-    grade = fields.Selection(
-        [
-            ("a+", "A+"),
-            ("a", "A"),
-            ("b+", "B+"),
-            ("b", "B"),
-            ("c+", "C+"),
-            ("c", "C"),
-            ("d", "D"),
-            ("f", "F"),
-        ],
-        string="Grade",
-    )
+    grade = fields.Selection(GRADE_SELECTION, string="Grade")
 
     score = fields.Float(string="Score (%)", help="Score percentage (0-100)")
     completion_date = fields.Date(string="Completion Date")
@@ -69,15 +90,15 @@ class EducationEnrollment(models.Model):
         "education.attendance", "enrollment_id", string="Attendance Records"
     )
 
-    # Computed Fields
+    # Attendance Counters (maintained incrementally by education.attendance)
     attendance_percentage = fields.Float(
-        string="Attendance %", compute="_compute_attendance_stats", store=True
+        string="Attendance %", readonly=True, copy=False
     )
     total_classes = fields.Integer(
-        string="Total Classes", compute="_compute_attendance_stats", store=True
+        string="Total Classes", readonly=True, copy=False, default=0
     )
     attended_classes = fields.Integer(
-        string="Attended Classes", compute="_compute_attendance_stats", store=True
+        string="Attended Classes", readonly=True, copy=False, default=0
     )
 
     # Multi-company and Currency Support
@@ -123,204 +144,521 @@ class EducationEnrollment(models.Model):
         ),
     ]
 
-    # Computed Methods
-    @api.depends("attendance_ids", "attendance_ids.state")
-    def _compute_attendance_stats(self):
-        for enrollment in self:
-            if enrollment.attendance_ids:
-                enrollment.total_classes = len(enrollment.attendance_ids)
-                enrollment.attended_classes = len(
-                    enrollment.attendance_ids.filtered(lambda a: a.state == "present")
-                )
-                enrollment.attendance_percentage = (
-                    (enrollment.attended_classes / enrollment.total_classes) * 100
-                    if enrollment.total_classes > 0
-                    else 0.0
+    def _auto_init(self):
+        res = super()._auto_init()
+        # Enrollment lookups by student, course and state (attendance wizards)
+        create_index(
+            self._cr,
+            "education_enrollment_student_course_state_index",
+            self._table,
+            ["student_id", "course_id", "state"],
+        )
+        return res
+
+    # Attendance Counter Methods
+    def _apply_attendance_deltas(self, deltas):
+        """Apply attendance counter deltas atomically.
+
+        ``deltas`` maps an enrollment id to a ``(total, attended)`` pair of
+        signed increments. Enrollments sharing the same pair are updated with
+        a single statement.
+        """
+        by_delta = defaultdict(list)
+        for enrollment_id, delta in deltas.items():
+            if any(delta):
+                by_delta[tuple(delta)].append(enrollment_id)
+        if not by_delta:
+            return
+
+        self.flush_model(["total_classes", "attended_classes"])
+        for (total, attended), enrollment_ids in by_delta.items():
+            self.env.cr.execute(
+                """
+                UPDATE education_enrollment
+                   SET total_classes = total_classes + %(total)s,
+                       attended_classes = attended_classes + %(attended)s,
+                       attendance_percentage = CASE
+                           WHEN total_classes + %(total)s > 0
+                           THEN 100.0 * (attended_classes + %(attended)s)
+                                / (total_classes + %(total)s)
+                           ELSE 0.0
+                       END
+                 WHERE id = ANY(%(ids)s)
+                """,
+                {"total": total, "attended": attended, "ids": enrollment_ids},
+            )
+        self.browse(
+            [eid for ids in by_delta.values() for eid in ids]
+        ).invalidate_recordset(
+            ["total_classes", "attended_classes", "attendance_percentage"]
+        )
+
+    def _rebuild_attendance_stats(self, batch_size=1000, dry_run=False):
+        """Recount attendance counters from scratch and repair any drift.
+
+        Works ``batch_size`` enrollments at a time. Returns the ids of the
+        enrollments whose stored counters had drifted.
+        """
+        enrollment_ids = self.ids
+        if not enrollment_ids:
+            return []
+        self.env["education.attendance"].flush_model(
+            ["enrollment_id", "state", "active"]
+        )
+        self.flush_model(["total_classes", "attended_classes"])
+
+        drifted_ids = []
+        for start in range(0, len(enrollment_ids), batch_size):
+            counts = SQL(
+                """
+                SELECT e.id,
+                       COALESCE(a.total, 0) AS total,
+                       COALESCE(a.attended, 0) AS attended
+                  FROM education_enrollment e
+             LEFT JOIN (
+                        SELECT enrollment_id,
+                               COUNT(*) AS total,
+                               COUNT(*) FILTER (WHERE state = 'present') AS attended
+                          FROM education_attendance
+                         WHERE enrollment_id = ANY(%(ids)s) AND active
+                      GROUP BY enrollment_id
+                       ) a ON a.enrollment_id = e.id
+                 WHERE e.id = ANY(%(ids)s)
+                """,
+                ids=enrollment_ids[start : start + batch_size],
+            )
+            if dry_run:
+                query = SQL(
+                    """
+                    SELECT e.id
+                      FROM education_enrollment e
+                      JOIN (%s) c ON c.id = e.id
+                     WHERE e.total_classes IS DISTINCT FROM c.total
+                        OR e.attended_classes IS DISTINCT FROM c.attended
+                    """,
+                    counts,
                 )
             else:
-                enrollment.total_classes = 0
-                enrollment.attended_classes = 0
-                enrollment.attendance_percentage = 0.0
+                # Repair the whole batch with one set-based UPDATE
+                query = SQL(
+                    """
+                    UPDATE education_enrollment e
+                       SET total_classes = c.total,
+                           attended_classes = c.attended,
+                           attendance_percentage = CASE
+                               WHEN c.total > 0 THEN 100.0 * c.attended / c.total
+                               ELSE 0.0
+                           END
+                      FROM (%s) c
+                     WHERE c.id = e.id
+                       AND (e.total_classes IS DISTINCT FROM c.total
+                            OR e.attended_classes IS DISTINCT FROM c.attended)
+                 RETURNING e.id
+                    """,
+                    counts,
+                )
+            self.env.cr.execute(query)
+            drifted_ids.extend(row[0] for row in self.env.cr.fetchall())
+
+        if drifted_ids:
+            _logger.info(
+                "Attendance counters drifted on %d enrollments%s",
+                len(drifted_ids),
+                " (dry run)" if dry_run else ", repaired",
+            )
+            if not dry_run:
+                self.browse(drifted_ids).invalidate_recordset(
+                    ["total_classes", "attended_classes", "attendance_percentage"]
+                )
+        return drifted_ids
+
+    @api.model
+    def _rebuild_all_attendance_stats(self, batch_size=1000, dry_run=False):
+        """Check and repair the attendance counters of every enrollment"""
+        enrollments = self.with_context(active_test=False).search([], order="id")
+        return enrollments._rebuild_attendance_stats(
+            batch_size=batch_size, dry_run=dry_run
+        )
+
+    def action_rebuild_attendance_stats(self):
+        """Maintenance action: recount attendance counters and repair drift"""
+        drifted_ids = self._rebuild_attendance_stats()
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("Attendance Statistics"),
+                "message": _("%d enrollments had drifted counters and were repaired.")
+                % len(drifted_ids),
+                "type": "success" if not drifted_ids else "warning",
+                "sticky": False,
+            },
+        }
 
     # Workflow Methods with Context Usage
     def action_confirm(self):
         """Confirm enrollment - Context: Demonstrates validation with context flags"""
-        for enrollment in self:
-            if enrollment.state != "draft":
-                raise UserError(_("Only draft enrollments can be confirmed."))
-
-            # Context-based validation
-            if not self.env.context.get("skip_prerequisites"):
-                enrollment._check_prerequisites()
+        if any(enrollment.state != "draft" for enrollment in self):
+            raise UserError(_("Only draft enrollments can be confirmed."))
 
-            if not self.env.context.get("skip_capacity"):
-                enrollment._check_course_capacity()
-
-            enrollment.write({"state": "confirmed"})
-
-            # Send notification to teacher (context-dependent)
-            if (
-                self.env.context.get("notify_teacher")
-                and enrollment.course_id.teacher_id
-            ):
-                enrollment._notify_teacher_enrollment()
+        # Context-based validation, prerequisites checked for the whole batch
+        if not self.env.context.get("skip_prerequisites"):
+            self._check_prerequisites()
 
+        self._run_confirm()
         return True
 
     def action_enroll(self):
         """Enroll student - Context: Demonstrates financial integration with context"""
-        for enrollment in self:
-            if enrollment.state != "confirmed":
-                raise UserError(_("Only confirmed enrollments can be enrolled."))
-
-            # Generate invoice (context-dependent)
-            if self.env.context.get("generate_invoice", True):
-                enrollment._generate_invoice()
-
-            enrollment.write(
-                {
-                    "state": "enrolled",
-                    "enrollment_date": fields.Date.context_today(enrollment),
-                }
-            )
-
-            # Create initial attendance records (context-dependent)
-            if self.env.context.get("create_attendance"):
-                enrollment._create_attendance_records()
+        if any(enrollment.state != "confirmed" for enrollment in self):
+            raise UserError(_("Only confirmed enrollments can be enrolled."))
 
+        self._run_enroll()
         return True
 
     def action_complete(self):
         """Complete enrollment - Context: Demonstrates grade validation"""
-        for enrollment in self:
-            if enrollment.state != "enrolled":
-                raise UserError(_("Only enrolled students can complete the course."))
+        self._raise_transition_failures(self._get_complete_failures())
+        self._run_complete()
+        return True
 
-            # Validate completion requirements
-            min_attendance = self.env.context.get("min_attendance_percentage", 75)
-            if enrollment.attendance_percentage < min_attendance:
-                raise UserError(
-                    _("Student does not meet minimum attendance requirement (%d%%).")
-                    % min_attendance
-                )
+    def action_cancel(self):
+        """Cancel enrollment - Context: Demonstrates refund processing"""
+        self._raise_transition_failures(self._get_cancel_failures())
+        self._run_cancel()
+        return True
 
-            # Auto-assign grade based on score (context-dependent)
-            if enrollment.score and self.env.context.get("auto_grade"):
-                enrollment._auto_assign_grade()
+    def action_fail(self):
+        """Mark enrollment as failed"""
+        self._raise_transition_failures(self._get_fail_failures())
+        self._run_fail()
+        return True
+
+    # Batch Transitions
+    def batch_transition(self, transition):
+        """Push these enrollments through ``transition`` as a set.
+
+        All checks run in bulk up front; records failing one are reported
+        instead of aborting the batch, and the others are moved with a few
+        grouped writes. Returns ``{"done": [ids], "failed": {id: reason}}``.
+        """
+        if transition not in self._BATCH_TRANSITIONS:
+            raise UserError(_("Unknown enrollment transition: %s") % transition)
+        self.check_access("write")
+
+        get_failures, run = self._BATCH_TRANSITIONS[transition]
+        failures = getattr(self, get_failures)()
+        done = self._without(failures)
+        if done:
+            getattr(done, run)()
+        return {
+            "done": done.ids,
+            "failed": {
+                enrollment.id: reason for enrollment, reason in failures.items()
+            },
+        }
 
-            enrollment.write(
-                {
-                    "state": "completed",
-                    "completion_date": fields.Date.context_today(enrollment),
-                }
+    def _without(self, failures):
+        return self.filtered(lambda enrollment: enrollment not in failures)
+
+    def _raise_transition_failures(self, failures):
+        if failures:
+            raise UserError(next(iter(failures.values())))
+
+    def _get_state_failures(self, states, message):
+        return {
+            enrollment: message for enrollment in self if enrollment.state not in states
+        }
+
+    def _get_confirm_failures(self):
+        """Return ``{enrollment: reason}`` for enrollments that cannot be
+        confirmed; free seats are locked so the confirmation cannot race"""
+        failures = self._get_state_failures(
+            ("draft",), _("Only draft enrollments can be confirmed.")
+        )
+        if not self.env.context.get("skip_prerequisites"):
+            for enrollment, missing in (
+                self._without(failures)._get_prerequisite_failures().items()
+            ):
+                failures[enrollment] = _(
+                    "Student has not completed prerequisite courses: %s"
+                ) % ", ".join(missing.mapped("name"))
+
+        if not self.env.context.get("skip_capacity"):
+            candidates = self._without(failures)
+            free_seats = self.env["education.course"]._lock_free_seats(
+                candidates.course_id.ids
             )
+            for enrollment in candidates.sorted("id"):
+                course_id = enrollment.course_id.id
+                if free_seats.get(course_id) is None:
+                    continue
+                if free_seats[course_id] <= 0:
+                    failures[enrollment] = enrollment.course_id._seat_capacity_error()
+                else:
+                    free_seats[course_id] -= 1
+        return failures
+
+    def _run_confirm(self):
+        # Course seats are reserved atomically by write (see skip_capacity)
+        self.write({"state": "confirmed"})
+
+        # Send notification to teacher (context-dependent)
+        if self.env.context.get("notify_teacher"):
+            for enrollment in self.filtered("course_id.teacher_id"):
+                enrollment._notify_teacher_enrollment()
 
-            # Issue certificate (context-dependent)
-            if self.env.context.get("issue_certificate"):
-                enrollment._issue_certificate()
+    def _get_enroll_failures(self):
+        failures = self._get_state_failures(
+            ("confirmed",), _("Only confirmed enrollments can be enrolled.")
+        )
+        if self.env.context.get("generate_invoice", True):
+            for enrollment in self._without(failures).filtered("invoice_id"):
+                failures[enrollment] = _("Invoice already exists for enrollment.")
+        return failures
 
-        return True
+    def _run_enroll(self):
+        # Generate invoices in one batch (context-dependent)
+        if self.env.context.get("generate_invoice", True):
+            self._generate_invoices()
 
-    def action_cancel(self):
-        """Cancel enrollment - Context: Demonstrates refund processing"""
-        for enrollment in self:
-            if enrollment.state in ["completed", "cancelled"]:
-                raise UserError(
-                    _("Cannot cancel completed or already cancelled enrollments.")
-                )
+        self.write(
+            {
+                "state": "enrolled",
+                "enrollment_date": fields.Date.context_today(self),
+            }
+        )
 
-            # Get cancellation reason from context
-            reason = self.env.context.get("cancellation_reason", "Student request")
+        # Create initial attendance records (context-dependent)
+        if self.env.context.get("create_attendance"):
+            for enrollment in self:
+                enrollment._create_attendance_records()
+
+    def _get_complete_failures(self):
+        failures = self._get_state_failures(
+            ("enrolled",), _("Only enrolled students can complete the course.")
+        )
+        # Validate completion requirements
+        min_attendance = self.env.context.get("min_attendance_percentage", 75)
+        for enrollment in self._without(failures):
+            if enrollment.attendance_percentage < min_attendance:
+                failures[enrollment] = (
+                    _("Student does not meet minimum attendance requirement (%d%%).")
+                    % min_attendance
+                )
+        return failures
 
-            enrollment.write({"state": "cancelled", "cancellation_reason": reason})
+    def _run_complete(self):
+        # Auto-assign grade based on score (context-dependent), one write per grade
+        vals = {
+            "state": "completed",
+            "completion_date": fields.Date.context_today(self),
+        }
+        groups = defaultdict(lambda: self.browse())
+        graded = self.browse()
+        if self.env.context.get("auto_grade"):
+            graded = self.filtered("score")
+            grades = self.env["education.grade.band"]._get_grades(
+                graded.mapped("score")
+            )
+            for enrollment, grade in zip(graded, grades):
+                groups[grade] |= enrollment
+        groups[None] |= self - graded
+        for grade, enrollments in groups.items():
+            if enrollments:
+                enrollments.write(dict(vals, grade=grade) if grade else vals)
+
+        # Issue certificate (context-dependent)
+        if self.env.context.get("issue_certificate"):
+            for enrollment in self:
+                enrollment._issue_certificate()
 
-            # Process refund (context-dependent)
-            if enrollment.invoice_id and self.env.context.get("process_refund"):
-                enrollment._process_refund()
+    def _get_cancel_failures(self):
+        return {
+            enrollment: _("Cannot cancel completed or already cancelled enrollments.")
+            for enrollment in self
+            if enrollment.state in ("completed", "cancelled")
+        }
 
-        return True
+    def _run_cancel(self):
+        # Get cancellation reason from context
+        reason = self.env.context.get("cancellation_reason", "Student request")
+        self.write({"state": "cancelled", "cancellation_reason": reason})
 
-    def action_fail(self):
-        """Mark enrollment as failed"""
-        for enrollment in self:
-            if enrollment.state != "enrolled":
-                raise UserError(_("Only enrolled students can be marked as failed."))
+        # Process refund (context-dependent)
+        if self.env.context.get("process_refund"):
+            for enrollment in self.filtered("invoice_id"):
+                enrollment._process_refund()
 
-            enrollment.write({"state": "failed"})
+    def _get_fail_failures(self):
+        return self._get_state_failures(
+            ("enrolled",), _("Only enrolled students can be marked as failed.")
+        )
 
-        return True
+    def _run_fail(self):
+        self.write({"state": "failed"})
 
     # Validation Methods
     def _check_prerequisites(self):
-        """Check if student has completed prerequisite courses"""
+        """Check if students have completed all (transitive) prerequisites"""
+        failures = self._get_prerequisite_failures()
+        if failures:
+            raise ValidationError(
+                _("Students have not completed prerequisite courses:\n%s")
+                % "\n".join(
+                    f"{enrollment.student_id.name} - {enrollment.course_id.name}: "
+                    + ", ".join(missing.mapped("name"))
+                    for enrollment, missing in failures.items()
+                )
+            )
+
+    def _get_prerequisite_failures(self):
+        """Return ``{enrollment: missing prerequisite courses}``.
+
+        Uses the cached per-department prerequisite closure and loads the
+        completed courses of every student in a single query.
+        """
+        Course = self.env["education.course"]
+        required = {}
         for enrollment in self:
-            if enrollment.course_id.prerequisite_ids:
-                completed_courses = enrollment.student_id.enrollment_ids.filtered(
-                    lambda e: e.state == "completed"
-                ).mapped("course_id")
+            closure = Course._get_prerequisite_closure(
+                enrollment.course_id.department_id.id
+            )
+            if closure.get(enrollment.course_id.id):
+                required[enrollment] = closure[enrollment.course_id.id]
+        if not required:
+            return {}
 
-                missing_prerequisites = (
-                    enrollment.course_id.prerequisite_ids - completed_courses
-                )
-                if missing_prerequisites:
-                    raise ValidationError(
-                        _("Student has not completed prerequisite courses: %s")
-                        % ", ".join(missing_prerequisites.mapped("name"))
-                    )
+        completed = self._get_completed_course_ids(
+            [enrollment.student_id.id for enrollment in required]
+        )
+        failures = {}
+        for enrollment, prerequisite_ids in required.items():
+            missing_ids = prerequisite_ids - completed[enrollment.student_id.id]
+            if missing_ids:
+                failures[enrollment] = Course.browse(sorted(missing_ids))
+        return failures
+
+    @api.model
+    def _get_completed_course_ids(self, student_ids):
+        """Return ``{student_id: set(completed course ids)}`` in one query"""
+        completed = defaultdict(set)
+        for student, course in self._read_group(
+            [("student_id", "in", student_ids), ("state", "=", "completed")],
+            groupby=["student_id", "course_id"],
+        ):
+            completed[student.id].add(course.id)
+        return completed
 
     def _check_course_capacity(self):
-        """Check if course has available capacity"""
+        """Check if course has available capacity (non-locking pre-check)"""
         for enrollment in self:
-            if (
-                hasattr(enrollment.course_id, "capacity")
-                and enrollment.course_id.capacity
-            ):
-                current_enrollments = len(
-                    enrollment.course_id.enrollment_ids.filtered(
-                        lambda e: e.state in ["confirmed", "enrolled"]
-                    )
+            course = enrollment.course_id
+            if course.capacity and course.seats_taken >= course.capacity:
+                raise ValidationError(
+                    _("Course capacity exceeded. Cannot enroll more students.")
                 )
-                if current_enrollments >= enrollment.course_id.capacity:
-                    raise ValidationError(
-                        _("Course capacity exceeded. Cannot enroll more students.")
-                    )
 
     # Financial Integration Methods
     def _generate_invoice(self):
         """Generate invoice for enrollment - Context: Demonstrates accounting integration"""
         self.ensure_one()
+        return self._generate_invoices() or None
+
+    def _generate_invoices(self):
+        """Generate the invoices of all enrollments in one batch.
+
+        Journal and income account lookups go through the per-company cache,
+        every invoice is prepared up front and created with a single
+        multi-create. With the ``group_invoice_by_student`` context flag, the
+        enrollments of a student are billed together on one invoice.
+        """
+        invoiced = self.filtered("invoice_id")
+        if invoiced:
+            raise UserError(
+                _("Invoice already exists for enrollments: %s")
+                % ", ".join(invoiced.mapped("display_name"))
+            )
 
-        if self.invoice_id:
-            raise UserError(_("Invoice already exists for this enrollment."))
-
-        if not self.course_id.fee_amount:
-            return  # No fee, no invoice needed
-
-        # Get invoice values with context
-        invoice_vals = self._prepare_invoice_vals()
-
-        # Create invoice
-        invoice = self.env["account.move"].create(invoice_vals)
-        self.invoice_id = invoice.id
+        group_by_student = self.env.context.get("group_invoice_by_student")
+        invoice_vals = {}
+        enrollments_by_key = defaultdict(lambda: self.browse())
+        for enrollment in self.filtered(lambda e: e.course_id.fee_amount):
+            line_vals = enrollment._prepare_invoice_line_vals()
+            key = (
+                (enrollment.student_id.partner_id.id, enrollment.company_id.id)
+                if group_by_student
+                else enrollment.id
+            )
+            if key in invoice_vals:
+                invoice_vals[key]["invoice_line_ids"].append((0, 0, line_vals))
+                invoice_vals[key]["ref"] += f", {enrollment.course_id.name}"
+            else:
+                invoice_vals[key] = enrollment._prepare_invoice_vals(
+                    line_vals=line_vals
+                )
+            enrollments_by_key[key] |= enrollment
+
+        if not invoice_vals:
+            return self.env["account.move"]
+
+        invoices = self.env["account.move"].create(list(invoice_vals.values()))
+        self._link_invoices(
+            [
+                (enrollment.id, invoice.id)
+                for invoice, key in zip(invoices, invoice_vals)
+                for enrollment in enrollments_by_key[key]
+            ]
+        )
 
-        # Auto-confirm invoice (context-dependent)
+        # Auto-confirm invoices (context-dependent), posted in the background
         if self.env.context.get("auto_confirm_invoice"):
-            invoice.action_post()
+            self.env["education.invoice.job"]._enqueue(invoices, "post_invoice")
+
+        return invoices
+
+    def _link_invoices(self, rows):
+        """Set ``invoice_id`` of many enrollments with a single UPDATE.
+
+        ``rows`` is a list of ``(enrollment_id, invoice_id)``.
+        """
+        if not rows:
+            return
+        enrollments = self.browse([row[0] for row in rows])
+        enrollments.check_access("write")
+        enrollments._schedule_fee_refresh()
+        enrollments.flush_recordset(["invoice_id"])
+        self.env.cr.execute(
+            SQL(
+                """
+                UPDATE education_enrollment e
+                   SET invoice_id = v.invoice_id,
+                       write_uid = %s,
+                       write_date = now() AT TIME ZONE 'UTC'
+                  FROM (VALUES %s) AS v(id, invoice_id)
+                 WHERE e.id = v.id
+                """,
+                self.env.uid,
+                SQL(", ").join(SQL("(%s, %s)", *row) for row in rows),
+            )
+        )
+        enrollments.invalidate_recordset(["invoice_id", "write_uid", "write_date"])
+        enrollments.modified(["invoice_id"])
 
-        return invoice
+    def _get_invoice_journal(self):
+        """Get the sale journal from context or the enrollment company"""
+        if self.env.context.get("invoice_journal_id"):
+            return self.env.context["invoice_journal_id"]
+        self._get_invoice_cache_counters()["journal_calls"] += 1
+        return self._get_cached_sale_journal_id(self.company_id.id)
 
-    def _prepare_invoice_vals(self):
+    def _prepare_invoice_vals(self, journal_id=None, line_vals=None):
         """Prepare invoice values - Context: Demonstrates context-based configuration"""
         self.ensure_one()
 
         # Get journal from context or default
-        journal_id = self.env.context.get("invoice_journal_id")
-        if not journal_id:
-            journal = self.env["account.journal"].search(
-                [("type", "=", "sale"), ("company_id", "=", self.company_id.id)],
-                limit=1,
-            )
-            journal_id = journal.id if journal else False
+        if journal_id is None:
+            journal_id = self._get_invoice_journal()
 
         # Get payment terms from context
         payment_term_id = self.env.context.get("payment_term_id")
@@ -333,35 +671,94 @@ class EducationEnrollment(models.Model):
             "invoice_date": fields.Date.context_today(self),
             "ref": f"Enrollment: {self.course_id.name}",
             "invoice_line_ids": [
-                (
-                    0,
-                    0,
-                    {
-                        "product_id": (
-                            self.course_id.product_id.id
-                            if self.course_id.product_id
-                            else False
-                        ),
-                        "name": f"Course Enrollment: {self.course_id.name}",
-                        "quantity": 1,
-                        "price_unit": self.course_id.fee_amount,
-                        "account_id": self._get_income_account(),
-                    },
-                )
+                (0, 0, line_vals or self._prepare_invoice_line_vals()),
             ],
         }
 
+    def _prepare_invoice_line_vals(self, income_account_id=None):
+        """Prepare the invoice line billing this enrollment's course fee"""
+        self.ensure_one()
+        if income_account_id is None:
+            income_account_id = self._get_income_account()
+        return {
+            "product_id": (
+                self.course_id.product_id.id if self.course_id.product_id else False
+            ),
+            "name": f"Course Enrollment: {self.course_id.name}",
+            "quantity": 1,
+            "price_unit": self.course_id.fee_amount,
+            "account_id": income_account_id,
+        }
+
     def _get_income_account(self):
         """Get income account for enrollment"""
-        if self.course_id.product_id:
-            return self.course_id.product_id.property_account_income_id.id
+        self._get_invoice_cache_counters()["income_account_calls"] += 1
+        return self._get_cached_income_account_id(
+            self.company_id.id, self.course_id.product_id.id
+        )
+
+    # Invoice Resolution Cache
+    # Journals and income accounts are cached per company (and course product)
+    # in the registry cache. The account.journal, account.account and
+    # product.template extensions clear it when a field read here changes.
+    @api.model
+    @tools.ormcache("company_id")
+    def _get_cached_sale_journal_id(self, company_id):
+        self._get_invoice_cache_counters()["journal_misses"] += 1
+        journal = (
+            self.env["account.journal"]
+            .sudo()
+            .search([("type", "=", "sale"), ("company_id", "=", company_id)], limit=1)
+        )
+        return journal.id or False
+
+    @api.model
+    @tools.ormcache("company_id", "product_id")
+    def _get_cached_income_account_id(self, company_id, product_id):
+        self._get_invoice_cache_counters()["income_account_misses"] += 1
+        return self._resolve_income_account_id(company_id, product_id)
+
+    @api.model
+    def _resolve_income_account_id(self, company_id, product_id):
+        if product_id:
+            product = (
+                self.env["product.product"]
+                .sudo()
+                .with_company(company_id)
+                .browse(product_id)
+            )
+            return product.property_account_income_id.id or False
 
         # Default income account
-        account = self.env["account.account"].search(
-            [("account_type", "=", "income"), ("company_id", "=", self.company_id.id)],
+        Account = self.env["account.account"].sudo()
+        account = Account.search(
+            [
+                ("account_type", "=", "income"),
+                *Account._check_company_domain(company_id),
+            ],
             limit=1,
         )
-        return account.id if account else False
+        return account.id or False
+
+    @api.model
+    def _get_invoice_cache_counters(self):
+        return INVOICE_CACHE_STATS[self.env.cr.dbname]
+
+    @api.model
+    def _get_invoice_cache_stats(self):
+        """Return hit/miss counters of the invoice resolution cache.
+
+        Counters are per worker process and database, cumulative since the
+        process started.
+        """
+        counters = self._get_invoice_cache_counters()
+        return {
+            name: {
+                "hits": counters[f"{name}_calls"] - counters[f"{name}_misses"],
+                "misses": counters[f"{name}_misses"],
+            }
+            for name in ("journal", "income_account")
+        }
 
     def _process_refund(self):
         """Process refund for cancelled enrollment"""
@@ -380,9 +777,9 @@ class EducationEnrollment(models.Model):
 
         refund = self.env["account.move"].create(refund_vals)
 
-        # Auto-confirm refund (context-dependent)
+        # Auto-confirm refund (context-dependent), posted in the background
         if self.env.context.get("auto_confirm_refund"):
-            refund.action_post()
+            self.env["education.invoice.job"]._enqueue(refund, "post_refund")
 
     # Helper Methods
     def _notify_teacher_enrollment(self):
@@ -399,23 +796,11 @@ class EducationEnrollment(models.Model):
     def _auto_assign_grade(self):
         """Auto-assign grade based on score"""
         self.ensure_one()
+        self.grade = self._get_auto_grade(self.score)
 
-        if self.score >= 95:
-            self.grade = "a+"
-        elif self.score >= 90:
-            self.grade = "a"
-        elif self.score >= 85:
-            self.grade = "b+"
-        elif self.score >= 80:
-            self.grade = "b"
-        elif self.score >= 75:
-            self.grade = "c+"
-        elif self.score >= 70:
-            self.grade = "c"
-        elif self.score >= 60:
-            self.grade = "d"
-        else:
-            self.grade = "f"
+    @api.model
+    def _get_auto_grade(self, score):
+        return self.env["education.grade.band"]._get_grades([score])[0]
 
     def _issue_certificate(self):
         """Issue completion certificate"""
@@ -468,20 +853,69 @@ class EducationEnrollment(models.Model):
         return action
 
     # Override Methods
-    @api.model
-    def create(self, vals):
+    @api.model_create_multi
+    def create(self, vals_list):
         """Override create to demonstrate context usage"""
         # Set default course based on context
-        if not vals.get("course_id") and self.env.context.get("default_course_id"):
-            vals["course_id"] = self.env.context.get("default_course_id")
+        default_course_id = self.env.context.get("default_course_id")
+        if default_course_id:
+            for vals in vals_list:
+                if not vals.get("course_id"):
+                    vals["course_id"] = default_course_id
 
-        enrollment = super().create(vals)
+        enrollments = super().create(vals_list)
+        enrollments._update_course_seats(enrollments._get_seat_deltas(1))
+        enrollments.filtered("invoice_id")._schedule_fee_refresh()
 
-        # Auto-confirm if context flag is set
+        # Auto-confirm the whole batch if context flag is set
         if self.env.context.get("auto_confirm"):
-            enrollment.action_confirm()
+            enrollments.action_confirm()
 
-        return enrollment
+        return enrollments
+
+    def write(self, vals):
+        fees_changed = bool({"student_id", "invoice_id"}.intersection(vals))
+        if fees_changed:
+            self._schedule_fee_refresh()
+        if not {"state", "course_id"}.intersection(vals):
+            result = super().write(vals)
+        else:
+            deltas = self._get_seat_deltas(-1)
+            result = super().write(vals)
+            self._update_course_seats(self._get_seat_deltas(1, deltas))
+        if fees_changed:
+            self._schedule_fee_refresh()
+        return result
+
+    def unlink(self):
+        deltas = self._get_seat_deltas(-1)
+        self._schedule_fee_refresh()
+        result = super().unlink()
+        self._update_course_seats(deltas)
+        return result
+
+    def _schedule_fee_refresh(self):
+        """Refresh the fee totals of the enrolled students before commit"""
+        self.env["education.student"]._schedule_fee_refresh(
+            student_ids=self.student_id.ids
+        )
+
+    # Seat Methods
+    def _get_seat_deltas(self, sign, deltas=None):
+        """Add the seats held by these enrollments, times ``sign``, to
+        ``{course_id: seats}``"""
+        deltas = defaultdict(int) if deltas is None else deltas
+        for enrollment in self:
+            if enrollment.state in self._SEAT_STATES and enrollment.course_id:
+                deltas[enrollment.course_id.id] += sign
+        return deltas
+
+    def _update_course_seats(self, deltas):
+        """Reserve/release course seats; capacity is enforced atomically
+        unless the ``skip_capacity`` context flag is set"""
+        self.env["education.course"]._apply_seat_deltas(
+            deltas, force=self.env.context.get("skip_capacity")
+        )
 
     # Python Constraints
     @api.constrains("enrollment_date", "completion_date")
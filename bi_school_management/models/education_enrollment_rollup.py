@@ -0,0 +1,224 @@
+import logging
+
+from odoo import api, fields, models
+from odoo.tools.sql import create_index, table_exists
+
+from .education_student import STUDENT_STATE_SELECTION
+
+_logger = logging.getLogger(__name__)
+
+# Student gender, students without one are counted as "unknown"
+GENDER_SELECTION = [
+    ("male", "Male"),
+    ("female", "Female"),
+    ("other", "Other"),
+    ("unknown", "Unknown"),
+]
+
+
+class EducationEnrollmentRollup(models.Model):
+    _name = "education.enrollment.rollup"
+    _description = "Student Headcount Rollup"
+    _order = "school_id, department_id, academic_year_id, class_id, state"
+    _rec_name = "class_id"
+
+    # Per class, student state and gender counts, maintained incrementally
+    # by education.student create/write/unlink and res.partner gender writes
+    class_id = fields.Many2one(
+        "education.class",
+        string="Class",
+        required=True,
+        readonly=True,
+        ondelete="cascade",
+    )
+    state = fields.Selection(
+        STUDENT_STATE_SELECTION,
+        string="State",
+        required=True,
+        readonly=True,
+    )
+    gender = fields.Selection(
+        GENDER_SELECTION, string="Gender", required=True, readonly=True
+    )
+    school_id = fields.Many2one("education.school", string="School", readonly=True)
+    department_id = fields.Many2one(
+        "education.department", string="Department", readonly=True
+    )
+    academic_year_id = fields.Many2one(
+        "education.academic.year", string="Academic Year", readonly=True
+    )
+    company_id = fields.Many2one("res.company", string="Company", readonly=True)
+    student_count = fields.Integer(string="Students", readonly=True, default=0)
+
+    _sql_constraints = [
+        (
+            "class_state_unique",
+            "unique(class_id, state, gender)",
+            "Only one headcount row per class, state and gender!",
+        ),
+    ]
+
+    def _auto_init(self):
+        res = super()._auto_init()
+        # School and year dashboards filter on these before the state
+        create_index(
+            self._cr,
+            "education_enrollment_rollup_school_year_state_index",
+            self._table,
+            ["school_id", "academic_year_id", "state"],
+        )
+        create_index(
+            self._cr,
+            "education_enrollment_rollup_department_year_state_index",
+            self._table,
+            ["department_id", "academic_year_id", "state"],
+        )
+        return res
+
+    def init(self):
+        # Seed the rollup from existing students on first install, and
+        # again when upgrading from rows that were not split by gender
+        if not table_exists(self.env.cr, "education_student"):
+            return
+        self.env.cr.execute("""
+            SELECT NOT EXISTS (SELECT 1 FROM education_enrollment_rollup)
+                OR EXISTS (
+                    SELECT 1 FROM education_enrollment_rollup WHERE gender IS NULL
+                )
+            """)
+        if self.env.cr.fetchone()[0]:
+            self._rebuild()
+
+    @api.model
+    def get_headcount(self, domain=None, groupby=()):
+        """Return student headcounts with one grouped read of the rollup.
+
+        Without ``groupby`` the total count is returned, otherwise a list of
+        ``{<groupby field>: value, "count": n}`` dicts, many2one values being
+        ids. For example, the enrolled students per school of a year::
+
+            get_headcount(
+                [("academic_year_id", "=", year_id), ("state", "=", "enrolled")],
+                groupby=["school_id"],
+            )
+        """
+        groups = self._read_group(
+            domain or [], list(groupby), aggregates=["student_count:sum"]
+        )
+        if not groupby:
+            return groups[0][0] or 0
+        return [
+            dict(
+                {
+                    name: value.id if isinstance(value, models.BaseModel) else value
+                    for name, value in zip(groupby, group[:-1])
+                },
+                count=group[-1] or 0,
+            )
+            for group in groups
+        ]
+
+    @api.model
+    def _apply_student_deltas(self, deltas):
+        """Apply ``{(class_id, state, gender): count}`` deltas with upserts"""
+        deltas = {key: count for key, count in deltas.items() if count}
+        if not deltas:
+            return
+        self.env["education.class"].flush_model(
+            ["department_id", "academic_year_id", "company_id"]
+        )
+        self.env["education.department"].flush_model(["school_id"])
+        touched = []
+        for (class_id, state, gender), count in sorted(deltas.items()):
+            self.env.cr.execute(
+                """
+                INSERT INTO education_enrollment_rollup (
+                    class_id, state, gender, school_id, department_id,
+                    academic_year_id, company_id, student_count,
+                    create_uid, create_date, write_uid, write_date
+                )
+                SELECT c.id, %(state)s, %(gender)s, d.school_id, c.department_id,
+                       c.academic_year_id, c.company_id, %(count)s,
+                       %(uid)s, now() AT TIME ZONE 'UTC',
+                       %(uid)s, now() AT TIME ZONE 'UTC'
+                  FROM education_class c
+             LEFT JOIN education_department d ON d.id = c.department_id
+                 WHERE c.id = %(class_id)s
+                ON CONFLICT (class_id, state, gender) DO UPDATE SET
+                    student_count = education_enrollment_rollup.student_count
+                                    + EXCLUDED.student_count,
+                    write_uid = EXCLUDED.write_uid,
+                    write_date = EXCLUDED.write_date
+                RETURNING id
+                """,
+                {
+                    "class_id": class_id,
+                    "state": state,
+                    "gender": gender,
+                    "count": count,
+                    "uid": self.env.uid,
+                },
+            )
+            touched.extend(row[0] for row in self.env.cr.fetchall())
+
+        if touched:
+            self.env.cr.execute(
+                """
+                DELETE FROM education_enrollment_rollup
+                 WHERE id = ANY(%s) AND student_count <= 0
+                """,
+                (touched,),
+            )
+            self.invalidate_model()
+
+    @api.model
+    def _sync_class_fields(self, classes):
+        """Propagate school/department/year/company changes of ``classes``"""
+        classes.flush_recordset(["department_id", "academic_year_id", "company_id"])
+        self.env["education.department"].flush_model(["school_id"])
+        self.env.cr.execute(
+            """
+            UPDATE education_enrollment_rollup r
+               SET school_id = d.school_id,
+                   department_id = c.department_id,
+                   academic_year_id = c.academic_year_id,
+                   company_id = c.company_id
+              FROM education_class c
+         LEFT JOIN education_department d ON d.id = c.department_id
+             WHERE r.class_id = c.id AND c.id = ANY(%s)
+            """,
+            (classes.ids,),
+        )
+        self.invalidate_model(
+            ["school_id", "department_id", "academic_year_id", "company_id"]
+        )
+
+    @api.model
+    def _rebuild(self):
+        """Recompute the whole rollup from education_student"""
+        self.env["education.student"].flush_model(["class_id", "state", "gender"])
+        self.env.cr.execute("DELETE FROM education_enrollment_rollup")
+        self.env.cr.execute(
+            """
+            INSERT INTO education_enrollment_rollup (
+                class_id, state, gender, school_id, department_id,
+                academic_year_id, company_id, student_count,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT s.class_id, s.state, COALESCE(s.gender, 'unknown'),
+                   d.school_id, c.department_id, c.academic_year_id,
+                   c.company_id, COUNT(*),
+                   %(uid)s, now() AT TIME ZONE 'UTC',
+                   %(uid)s, now() AT TIME ZONE 'UTC'
+              FROM education_student s
+              JOIN education_class c ON c.id = s.class_id
+         LEFT JOIN education_department d ON d.id = c.department_id
+             WHERE s.state IS NOT NULL
+          GROUP BY s.class_id, s.state, COALESCE(s.gender, 'unknown'),
+                   d.school_id, c.department_id,
+                   c.academic_year_id, c.company_id
+            """,
+            {"uid": self.env.uid},
+        )
+        _logger.info("Rebuilt %d headcount rollup rows", self.env.cr.rowcount)
+        self.invalidate_model()
@@ -0,0 +1,75 @@
+from bisect import bisect_right
+
+from odoo import api, fields, models, tools
+
+from .education_enrollment import GRADE_SELECTION
+
+
+class EducationGradeBand(models.Model):
+    _name = "education.grade.band"
+    _description = "Education Grade Band"
+    _order = "min_score desc"
+    _rec_name = "grade"
+
+    grade = fields.Selection(GRADE_SELECTION, string="Grade", required=True)
+    min_score = fields.Float(
+        string="Minimum Score",
+        required=True,
+        help="Lowest score (inclusive) awarded this grade",
+    )
+    active = fields.Boolean(default=True)
+
+    _sql_constraints = [
+        (
+            "unique_min_score",
+            "unique(min_score)",
+            "Two grade bands cannot start at the same score!",
+        ),
+        (
+            "valid_min_score",
+            "check(min_score >= 0 AND min_score <= 100)",
+            "Minimum score must be between 0 and 100!",
+        ),
+    ]
+
+    # Band Lookup
+    @api.model
+    @tools.ormcache()
+    def _get_band_table(self):
+        """Return ``(thresholds, grades)`` sorted by ascending threshold.
+
+        Cached; cleared when bands are added, removed or rescored.
+        """
+        bands = self.sudo().search_fetch([], ["grade", "min_score"], order="min_score")
+        return (
+            tuple(bands.mapped("min_score")),
+            tuple(bands.mapped("grade")),
+        )
+
+    @api.model
+    def _get_grades(self, scores):
+        """Map every score to its grade with a binary search over the band
+        thresholds; scores below the lowest band map to ``False``"""
+        thresholds, grades = self._get_band_table()
+        result = []
+        for score in scores:
+            index = bisect_right(thresholds, score) - 1
+            result.append(grades[index] if index >= 0 else False)
+        return result
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        bands = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return bands
+
+    def write(self, vals):
+        result = super().write(vals)
+        if {"grade", "min_score", "active"}.intersection(vals):
+            self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self.env.registry.clear_cache()
+        return result
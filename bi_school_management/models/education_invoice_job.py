@@ -0,0 +1,205 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError
+from odoo.tools.sql import create_index
+
+_logger = logging.getLogger(__name__)
+
+
+class EducationInvoiceJob(models.Model):
+    _name = "education.invoice.job"
+    _description = "Education Invoice Posting Job"
+    _order = "id"
+
+    move_id = fields.Many2one(
+        "account.move", string="Journal Entry", required=True, ondelete="cascade"
+    )
+    job_type = fields.Selection(
+        [
+            ("post_invoice", "Post Invoice"),
+            ("post_refund", "Post Credit Note"),
+        ],
+        string="Job Type",
+        required=True,
+    )
+    state = fields.Selection(
+        [
+            ("pending", "Pending"),
+            ("done", "Done"),
+            ("dead", "Failed"),
+        ],
+        string="State",
+        default="pending",
+        required=True,
+    )
+    attempts = fields.Integer(string="Attempts", default=0, readonly=True)
+    next_attempt = fields.Datetime(
+        string="Next Attempt", default=fields.Datetime.now, readonly=True
+    )
+    last_error = fields.Text(string="Last Error", readonly=True)
+    done_date = fields.Datetime(string="Done On", readonly=True)
+    company_id = fields.Many2one(
+        related="move_id.company_id", string="Company", store=True
+    )
+
+    def _auto_init(self):
+        res = super()._auto_init()
+        # Workers only ever look for due pending jobs
+        create_index(
+            self._cr,
+            "education_invoice_job_pending_index",
+            self._table,
+            ["next_attempt", "id"],
+            where="state = 'pending'",
+        )
+        return res
+
+    @api.model
+    def _enqueue(self, moves, job_type):
+        """Queue ``moves`` for posting and wake the worker up"""
+        if not moves:
+            return self.browse()
+        jobs = self.sudo().create(
+            [{"move_id": move.id, "job_type": job_type} for move in moves]
+        )
+        self.env.ref("bi_school_management.ir_cron_process_invoice_jobs")._trigger()
+        return jobs
+
+    def action_retry(self):
+        """Give dead jobs a fresh set of attempts"""
+        if any(job.state != "dead" for job in self):
+            raise UserError(_("Only failed jobs can be retried."))
+        self.write(
+            {
+                "state": "pending",
+                "attempts": 0,
+                "next_attempt": fields.Datetime.now(),
+            }
+        )
+        self.env.ref("bi_school_management.ir_cron_process_invoice_jobs")._trigger()
+
+    @api.model
+    def _cron_process_jobs(self):
+        self._process_jobs()
+
+    @api.model
+    def _process_jobs(self, batch_size=None, time_budget=None, auto_commit=None):
+        """Post due jobs in chunks within a time budget.
+
+        Chunks are claimed with ``FOR UPDATE SKIP LOCKED`` so several workers
+        can share the queue, and each chunk is committed on its own. A chunk
+        is posted in one go; when that fails, its jobs are retried one by one
+        so a single bad entry does not hold back the others. Failing jobs are
+        retried with exponential backoff and end up ``dead`` after
+        ``bi_school_management.invoice_job_max_attempts`` attempts.
+        """
+        ICP = self.env["ir.config_parameter"].sudo()
+        if batch_size is None:
+            batch_size = int(
+                ICP.get_param("bi_school_management.invoice_job_batch_size", 100)
+            )
+        if time_budget is None:
+            time_budget = float(
+                ICP.get_param("bi_school_management.invoice_job_time_budget", 240)
+            )
+        if auto_commit is None:
+            auto_commit = not getattr(threading.current_thread(), "testing", False)
+        max_attempts = int(
+            ICP.get_param("bi_school_management.invoice_job_max_attempts", 5)
+        )
+
+        started = time.monotonic()
+        stats = {"done": 0, "retried": 0, "dead": 0}
+        while time.monotonic() - started < time_budget:
+            self.flush_model()
+            self.env.cr.execute(
+                """
+                SELECT id
+                  FROM education_invoice_job
+                 WHERE state = 'pending'
+                   AND next_attempt <= now() AT TIME ZONE 'UTC'
+              ORDER BY next_attempt, id
+                 LIMIT %s
+                   FOR UPDATE SKIP LOCKED
+                """,
+                (batch_size,),
+            )
+            jobs = self.browse(row[0] for row in self.env.cr.fetchall())
+            if not jobs:
+                break
+            for key, count in jobs._run_chunk(max_attempts).items():
+                stats[key] += count
+            if auto_commit:
+                self.env.cr.commit()
+            self.env.invalidate_all()
+
+        _logger.info(
+            "Invoice jobs: %(done)d posted, %(retried)d to retry, %(dead)d failed",
+            stats,
+        )
+        return stats
+
+    def _run_chunk(self, max_attempts):
+        stats = {"done": 0, "retried": 0, "dead": 0}
+        cancelled = self.filtered(lambda job: job.move_id.state == "cancel")
+        for job in cancelled:
+            job._mark_failed(_("The journal entry was cancelled."), max_attempts=0)
+        stats["dead"] += len(cancelled)
+
+        # Entries posted meanwhile need no posting
+        pending = self.filtered(lambda job: job.move_id.state == "draft")
+        failed = self.browse()
+        if pending._post_moves():
+            # Isolate the failing entries
+            for job in pending:
+                error = job._post_moves()
+                if error:
+                    job._mark_failed(error, max_attempts)
+                    failed |= job
+            stats["dead"] += len(failed.filtered(lambda job: job.state == "dead"))
+            stats["retried"] += len(failed.filtered(lambda job: job.state == "pending"))
+
+        done = self - cancelled - failed
+        done._mark_done()
+        stats["done"] += len(done)
+        return stats
+
+    def _post_moves(self):
+        """Post the entries of these jobs under a savepoint; return the error
+        message on failure"""
+        if not self:
+            return None
+        try:
+            with self.env.cr.savepoint():
+                self.move_id.action_post()
+        except Exception as error:
+            self.env.invalidate_all()
+            return str(error)
+        return None
+
+    def _mark_done(self):
+        self.write(
+            {"state": "done", "done_date": fields.Datetime.now(), "last_error": False}
+        )
+
+    def _mark_failed(self, error, max_attempts):
+        self.ensure_one()
+        attempts = self.attempts + 1
+        _logger.warning(
+            "Posting %s failed (attempt %d): %s",
+            self.move_id.display_name,
+            attempts,
+            error,
+        )
+        self.write(
+            {
+                "attempts": attempts,
+                "last_error": error,
+                "state": "dead" if attempts >= max_attempts else "pending",
+                "next_attempt": fields.Datetime.now() + timedelta(minutes=2**attempts),
+            }
+        )
@@ -1,10 +1,12 @@
-from odoo import _, api, fields, models
+from odoo import _, fields, models
+from odoo.tools.sql import table_exists
 
 
 class EducationSchool(models.Model):
     _name = "education.school"
     _description = "Education School"
-    _inherit = ["mail.thread", "mail.activity.mixin"]
+    _inherit = ["mail.thread", "mail.activity.mixin", "education.totals.mixin"]
+    _totals_fields = ("total_departments", "total_students")
 
     name = fields.Char(string="School Name", required=True, tracking=True)
     code = fields.Char(string="School Code", required=True, tracking=True)
@@ -37,20 +39,45 @@ class EducationSchool(models.Model):
     active = fields.Boolean(string="Active", default=True)
     established_date = fields.Date(string="Established Date")
 
-    # Computed Fields
+    # Totals, maintained by _refresh_totals
     total_departments = fields.Integer(
-        string="Total Departments", compute="_compute_totals", store=True
-    )
-    total_students = fields.Integer(
-        string="Total Students", compute="_compute_totals", store=True
+        string="Total Departments", readonly=True, copy=False
     )
+    total_students = fields.Integer(string="Total Students", readonly=True, copy=False)
 
     _sql_constraints = [
         ("code_uniq", "unique (code)", "School code must be unique."),
     ]
 
-    @api.depends("department_ids", "department_ids.student_ids")
-    def _compute_totals(self):
-        for school in self:
-            school.total_departments = len(school.department_ids)
-            school.total_students = len(school.department_ids.mapped("student_ids"))
+    # Totals
+    def _refresh_totals(self):
+        """Count active departments and their students per school (all
+        schools when empty)"""
+        cr = self.env.cr
+        if not all(
+            table_exists(cr, table)
+            for table in ("education_department", "education_student")
+        ):
+            return
+        self.env["education.department"].flush_model(["school_id", "active"])
+        self.env["education.student"].flush_model(["department_id"])
+        cr.execute(
+            """
+            UPDATE education_school school
+               SET total_departments = (
+                       SELECT COUNT(*) FROM education_department department
+                        WHERE department.school_id = school.id
+                          AND department.active
+                   ),
+                   total_students = (
+                       SELECT COUNT(*) FROM education_student student
+                         JOIN education_department department
+                           ON department.id = student.department_id
+                        WHERE department.school_id = school.id
+                          AND department.active
+                   )
+             WHERE %s OR school.id = ANY(%s)
+            """,
+            (not self.ids, self.ids),
+        )
+        self.invalidate_model(self._totals_fields)
@@ -0,0 +1,158 @@
+from odoo import _, api, fields, models
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+from odoo.tools.sql import table_exists
+
+
+class EducationSeatMixin(models.AbstractModel):
+    """Stored seat counter with atomic, capacity-checked reservations.
+
+    Inheriting models must define an integer ``capacity`` field (0 meaning
+    unlimited) and name the records holding their seats: the
+    ``_seat_holder_model`` and its many2one ``_seat_holder_field`` pointing
+    back to them. Holders take a seat while their ``state`` is in the
+    holder model's ``_SEAT_STATES``.
+    """
+
+    _name = "education.seat.mixin"
+    _description = "Education Seat Counter"
+
+    _seat_holder_model = None
+    _seat_holder_field = None
+
+    seats_taken = fields.Integer(
+        string="Seats Taken", readonly=True, copy=False, default=0
+    )
+
+    def init(self):
+        # Backfill counters for records created before they were maintained
+        if self._abstract:
+            return
+        self.browse()._recount_seats()
+
+    def _recount_seats(self):
+        """Recount ``seats_taken`` from scratch (all records when empty)"""
+        Holder = self.env[self._seat_holder_model]
+        if not table_exists(self.env.cr, Holder._table):
+            return
+        Holder.flush_model([self._seat_holder_field, "state"])
+        self.env.cr.execute(
+            SQL(
+                """
+                UPDATE %(table)s record
+                   SET seats_taken = (
+                           SELECT COUNT(*)
+                             FROM %(holder_table)s holder
+                            WHERE holder.%(holder_field)s = record.id
+                              AND holder.state = ANY(%(states)s)
+                       )
+                 WHERE %(all)s OR record.id = ANY(%(ids)s)
+             RETURNING record.id
+                """,
+                table=SQL.identifier(self._table),
+                holder_table=SQL.identifier(Holder._table),
+                holder_field=SQL.identifier(self._seat_holder_field),
+                states=list(Holder._SEAT_STATES),
+                all=not self.ids,
+                ids=self.ids,
+            )
+        )
+        self.browse(row[0] for row in self.env.cr.fetchall())._seats_changed()
+
+    def _seats_changed(self):
+        """Drop cached counters and recompute the fields depending on them"""
+        self.invalidate_recordset(["seats_taken"])
+        self.modified(["seats_taken"])
+
+    def _seat_capacity_error(self):
+        return _("%s capacity exceeded. Cannot enroll more students.") % (
+            self.display_name
+        )
+
+    @api.model
+    def _reserve_seats(self, counts, force=False):
+        """Take seats for ``{record_id: count}`` atomically.
+
+        Each counter is incremented by a conditional UPDATE that locks the row
+        and only succeeds while the capacity allows it, so concurrent
+        transactions can never oversubscribe. Rows are updated in id order to
+        keep lock acquisition deterministic. With ``force``, the capacity is
+        not enforced.
+        """
+        self.flush_model(["capacity", "seats_taken"])
+        for record_id, count in sorted(counts.items()):
+            if count <= 0:
+                continue
+            self.env.cr.execute(
+                SQL(
+                    """
+                    UPDATE %s
+                       SET seats_taken = seats_taken + %s
+                     WHERE id = %s
+                       AND (%s OR COALESCE(capacity, 0) <= 0
+                            OR seats_taken + %s <= capacity)
+                 RETURNING id
+                    """,
+                    SQL.identifier(self._table),
+                    count,
+                    record_id,
+                    bool(force),
+                    count,
+                )
+            )
+            if not self.env.cr.fetchone():
+                raise ValidationError(self.browse(record_id)._seat_capacity_error())
+        self.browse(list(counts))._seats_changed()
+
+    @api.model
+    def _lock_free_seats(self, ids):
+        """Lock the counters of ``ids`` until the end of the transaction and
+        return ``{record_id: free seats}``, ``None`` meaning unlimited"""
+        if not ids:
+            return {}
+        self.flush_model(["capacity", "seats_taken"])
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT id, capacity, seats_taken
+                  FROM %s
+                 WHERE id = ANY(%s)
+              ORDER BY id
+                   FOR UPDATE
+                """,
+                SQL.identifier(self._table),
+                list(ids),
+            )
+        )
+        return {
+            record_id: capacity - seats_taken if capacity and capacity > 0 else None
+            for record_id, capacity, seats_taken in self.env.cr.fetchall()
+        }
+
+    @api.model
+    def _release_seats(self, counts):
+        """Give back seats for ``{record_id: count}``"""
+        self.flush_model(["seats_taken"])
+        for record_id, count in sorted(counts.items()):
+            if count <= 0:
+                continue
+            self.env.cr.execute(
+                SQL(
+                    "UPDATE %s SET seats_taken = GREATEST(seats_taken - %s, 0) WHERE id = %s",
+                    SQL.identifier(self._table),
+                    count,
+                    record_id,
+                )
+            )
+        self.browse(list(counts))._seats_changed()
+
+    @api.model
+    def _apply_seat_deltas(self, deltas, force=False):
+        """Release negative and reserve positive ``{record_id: delta}``"""
+        self._release_seats(
+            {record_id: -delta for record_id, delta in deltas.items() if delta < 0}
+        )
+        self._reserve_seats(
+            {record_id: delta for record_id, delta in deltas.items() if delta > 0},
+            force=force,
+        )
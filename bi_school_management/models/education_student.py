@@ -1,7 +1,18 @@
+from collections import defaultdict
 from datetime import datetime, timedelta
 
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError, ValidationError
+from odoo.tools import SQL
+
+STUDENT_STATE_SELECTION = [
+    ("draft", "Draft"),
+    ("enrolled", "Enrolled"),
+    ("transferred", "Transferred"),
+    ("graduated", "Graduated"),
+    ("suspended", "Suspended"),
+    ("dropped", "Dropped Out"),
+]
 
 
 class EducationStudent(models.Model):
@@ -10,6 +21,11 @@ class EducationStudent(models.Model):
     _inherit = ["mail.thread", "mail.activity.mixin"]
     _order = "student_id, name"
 
+    # States holding a seat in the class
+    _SEAT_STATES = ("enrolled", "suspended")
+    # Pre-commit data key of the pending fee refresh
+    _FEE_REFRESH_KEY = "education.student.fee_refresh"
+
     # Basic Information
     partner_id = fields.Many2one(
         "res.partner", string="Student", required=True, tracking=True
@@ -27,14 +43,7 @@ class EducationStudent(models.Model):
 
     # State Management with Workflow
     state = fields.Selection(
-        [
-            ("draft", "Draft"),
-            ("enrolled", "Enrolled"),
-            ("transferred", "Transferred"),
-            ("graduated", "Graduated"),
-            ("suspended", "Suspended"),
-            ("dropped", "Dropped Out"),
-        ],
+        STUDENT_STATE_SELECTION,
         string="State",
         default="draft",
         tracking=True,
@@ -59,11 +68,10 @@ class EducationStudent(models.Model):
     attendance_percentage = fields.Float(
         string="Attendance %", compute="_compute_attendance_percentage", store=True
     )
-    total_fees = fields.Monetary(
-        string="Total Fees", compute="_compute_total_fees", store=True
-    )
+    # Maintained in SQL by _refresh_fee_totals
+    total_fees = fields.Monetary(string="Total Fees", readonly=True, copy=False)
     outstanding_fees = fields.Monetary(
-        string="Outstanding Fees", compute="_compute_total_fees", store=True
+        string="Outstanding Fees", readonly=True, copy=False
     )
 
     # Multi-company and Currency Support
@@ -177,33 +185,26 @@ class EducationStudent(models.Model):
 
     @api.depends("attendance_ids", "attendance_ids.state")
     def _compute_attendance_percentage(self):
-        for student in self:
-            if student.attendance_ids:
-                total_days = len(student.attendance_ids)
-                present_days = len(
-                    student.attendance_ids.filtered(lambda a: a.state == "present")
-                )
-                student.attendance_percentage = (
-                    (present_days / total_days) * 100 if total_days > 0 else 0.0
-                )
-            else:
-                student.attendance_percentage = 0.0
+        """Compute attendance % from one grouped query for the whole batch"""
+        total_days = defaultdict(int)
+        present_days = defaultdict(int)
+        if self.ids:
+            groups = self.env["education.attendance"]._read_group(
+                [("student_id", "in", self.ids)],
+                groupby=["student_id", "state"],
+                aggregates=["__count"],
+            )
+            for student, state, count in groups:
+                total_days[student.id] += count
+                if state == "present":
+                    present_days[student.id] += count
 
-    @api.depends(
-        "enrollment_ids",
-        "enrollment_ids.invoice_id",
-        "enrollment_ids.invoice_id.payment_state",
-    )
-    def _compute_total_fees(self):
         for student in self:
-            invoices = student.enrollment_ids.mapped("invoice_id").filtered(
-                lambda inv: inv.move_type == "out_invoice"
-            )
-            student.total_fees = sum(invoices.mapped("amount_total"))
-            student.outstanding_fees = sum(
-                invoices.filtered(lambda inv: inv.payment_state != "paid").mapped(
-                    "amount_total"
-                )
+            student_id = student._origin.id
+            student.attendance_percentage = (
+                (present_days[student_id] / total_days[student_id]) * 100
+                if total_days[student_id]
+                else 0.0
             )
 
     @api.depends("date_of_birth")
@@ -224,32 +225,79 @@ class EducationStudent(models.Model):
 
     # Workflow Methods
     def action_enroll(self):
-        """Enroll student - Context: Demonstrates state workflow with validation"""
-        self.ensure_one()
-        if self.state != "draft":
-            raise UserError(_("Only draft students can be enrolled."))
+        """Enroll students - Context: Demonstrates state workflow with validation"""
+        failures = self._get_enroll_failures()
+        if failures:
+            raise UserError(next(iter(failures.values())))
+        self._run_enroll()
+        return True
 
-        # Validation using context
+    def batch_enroll(self):
+        """Enroll these students as a set.
+
+        Age and class capacity are checked in bulk and the free seats of every
+        class are locked and handed out in one step. Students that cannot be
+        enrolled are reported instead of aborting the batch. Returns
+        ``{"done": [ids], "failed": {id: reason}}``.
+        """
+        self.check_access("write")
+        failures = self._get_enroll_failures()
+        done = self.filtered(lambda student: student not in failures)
+        if done:
+            done._run_enroll()
+        return {
+            "done": done.ids,
+            "failed": {student.id: reason for student, reason in failures.items()},
+        }
+
+    def _get_enroll_failures(self):
+        """Return ``{student: reason}`` for students that cannot be enrolled"""
+        failures = {
+            student: _("Only draft students can be enrolled.")
+            for student in self
+            if student.state != "draft"
+        }
+        # Validation using context (skipped for bulk operations)
         if self.env.context.get("skip_validation"):
-            # Context flag to skip validation for bulk operations
-            pass
-        else:
-            self._validate_enrollment()
+            return failures
 
+        for student in self.filtered(lambda student: student not in failures):
+            reason = student._get_enrollment_error()
+            if reason:
+                failures[student] = reason
+
+        if not self.env.context.get("skip_capacity"):
+            candidates = self.filtered(lambda student: student not in failures)
+            free_seats = self.env["education.class"]._lock_free_seats(
+                candidates.class_id.ids
+            )
+            for student in candidates.sorted("id"):
+                class_id = student.class_id.id
+                if free_seats.get(class_id) is None:
+                    continue
+                if free_seats[class_id] <= 0:
+                    failures[student] = student.class_id._seat_capacity_error()
+                else:
+                    free_seats[class_id] -= 1
+        return failures
+
+    def _run_enroll(self):
+        # Class seats are reserved atomically by write (see skip_capacity)
         self.write(
             {"state": "enrolled", "enrollment_date": fields.Date.context_today(self)}
         )
 
-        # Create activity for class teacher
-        if self.class_id.teacher_id:
-            self.activity_schedule(
+        # One digest activity per class for its teacher
+        for school_class in self.class_id.filtered("teacher_id.user_id"):
+            students = self.filtered(lambda student: student.class_id == school_class)
+            school_class.activity_schedule(
                 "mail.mail_activity_data_todo",
-                user_id=self.class_id.teacher_id.user_id.id,
-                note=_("New student %s enrolled in your class.") % self.name,
+                user_id=school_class.teacher_id.user_id.id,
+                summary=_("%d new students") % len(students),
+                note=_("New students enrolled in your class: %s")
+                % ", ".join(students.mapped("name")),
             )
 
-        return True
-
     def action_transfer(self):
         """Transfer student - Context: Demonstrates wizard with context passing"""
         self.ensure_one()
@@ -274,24 +322,36 @@ class EducationStudent(models.Model):
         }
 
     def action_graduate(self):
-        """Graduate student - Context: Demonstrates conditional workflow"""
-        self.ensure_one()
-        if self.state != "enrolled":
-            raise UserError(_("Only enrolled students can be graduated."))
+        """Graduate students - Context: Demonstrates conditional workflow"""
+        failures = self._get_graduation_failures()
+        if failures:
+            raise UserError(next(iter(failures.values())))
+        self._run_graduate()
+        return True
 
-        # Check if student has completed all required courses
-        if not self._check_graduation_requirements():
-            raise UserError(_("Student has not completed all graduation requirements."))
+    def batch_graduate(self):
+        """Graduate these students as a set; students missing a requirement
+        are reported instead of aborting the batch. Returns
+        ``{"done": [ids], "failed": {id: reason}}``."""
+        self.check_access("write")
+        failures = self._get_graduation_failures()
+        done = self.filtered(lambda student: student not in failures)
+        if done:
+            done._run_graduate()
+        return {
+            "done": done.ids,
+            "failed": {student.id: reason for student, reason in failures.items()},
+        }
 
+    def _run_graduate(self):
         self.write(
             {"state": "graduated", "graduation_date": fields.Date.context_today(self)}
         )
 
         # Create graduation certificate (context-dependent)
         if self.env.context.get("create_certificate"):
-            self._create_graduation_certificate()
-
-        return True
+            for student in self:
+                student._create_graduation_certificate()
 
     def action_suspend(self):
         """Suspend student - Context: Demonstrates reason tracking"""
@@ -333,41 +393,86 @@ class EducationStudent(models.Model):
     # Validation Methods
     def _validate_enrollment(self):
         """Validate enrollment requirements"""
+        for student in self:
+            reason = student._get_enrollment_error()
+            if reason:
+                raise ValidationError(reason)
+
+    def _get_enrollment_error(self):
+        """Return why this student cannot be enrolled, if anything.
+
+        Class capacity is enforced atomically when the seat is reserved.
+        """
+        self.ensure_one()
         if not self.partner_id:
-            raise ValidationError(_("Student partner is required."))
+            return _("Student partner is required.")
 
         if not self.class_id:
-            raise ValidationError(_("Class assignment is required for enrollment."))
-
-        # Check class capacity
-        if (
-            self.class_id.capacity
-            and len(self.class_id.student_ids) >= self.class_id.capacity
-        ):
-            raise ValidationError(
-                _("Class capacity exceeded. Cannot enroll more students.")
-            )
+            return _("Class assignment is required for enrollment.")
 
         # Check age requirements (context-dependent)
         min_age = self.env.context.get("min_age", 5)
         if self.age and self.age < min_age:
-            raise ValidationError(
-                _("Student is too young for enrollment. Minimum age: %d") % min_age
-            )
+            return _("Student is too young for enrollment. Minimum age: %d") % min_age
+        return None
 
     def _check_graduation_requirements(self):
         """Check if student meets graduation requirements"""
+        self.ensure_one()
+        return not self._get_graduation_failures()
+
+    def _get_graduation_failures(self):
+        """Return ``{student: reason}`` for students that cannot graduate.
+
+        Required courses are loaded once per department and completed courses
+        once for all students, so a whole cohort costs a couple of queries.
+        The attendance threshold comes from the ``min_attendance_percentage``
+        context key (75 by default).
+        """
+        failures = {
+            student: _("Only enrolled students can be graduated.")
+            for student in self
+            if student.state != "enrolled"
+        }
+        candidates = self.filtered(lambda student: student not in failures)
+        if not candidates:
+            return failures
+
         # Check minimum attendance
-        if self.attendance_percentage < 75:
-            return False
+        min_attendance = self.env.context.get("min_attendance_percentage", 75)
+        for student in candidates:
+            if student.attendance_percentage < min_attendance:
+                failures[student] = (
+                    _("Student does not meet minimum attendance requirement (%d%%).")
+                    % min_attendance
+                )
 
         # Check if all required courses are completed
-        required_courses = self.class_id.department_id.course_ids.filtered("required")
-        completed_courses = self.enrollment_ids.filtered(
-            lambda e: e.state == "completed"
-        ).mapped("course_id")
+        candidates = candidates.filtered(lambda student: student not in failures)
+        required = self._get_required_course_ids(candidates.department_id.ids)
+        completed = self.env["education.enrollment"]._get_completed_course_ids(
+            candidates.ids
+        )
+        Course = self.env["education.course"]
+        for student in candidates:
+            missing_ids = required[student.department_id.id] - completed[student.id]
+            if missing_ids:
+                failures[student] = _(
+                    "Student has not completed required courses: %s"
+                ) % ", ".join(Course.browse(sorted(missing_ids)).mapped("name"))
+        return failures
 
-        return all(course in completed_courses for course in required_courses)
+    @api.model
+    def _get_required_course_ids(self, department_ids):
+        """Return ``{department_id: frozenset(required course ids)}``"""
+        required = defaultdict(frozenset)
+        for department, course_ids in self.env["education.course"]._read_group(
+            [("department_id", "in", department_ids), ("required", "=", True)],
+            groupby=["department_id"],
+            aggregates=["id:array_agg"],
+        ):
+            required[department.id] = frozenset(course_ids)
+        return required
 
     def _create_graduation_certificate(self):
         """Create graduation certificate document"""
@@ -462,19 +567,272 @@ class EducationStudent(models.Model):
     # Override Methods
     @api.model_create_multi
     def create(self, vals_list):
-        return super().create(vals_list)
+        self._assign_student_ids(vals_list)
+        students = super().create(vals_list)
+        students._update_class_seats(students._get_class_seat_deltas(1))
+        self.env["education.enrollment.rollup"]._apply_student_deltas(
+            students._get_rollup_deltas(1)
+        )
+        students._schedule_class_totals_refresh()
+        return students
+
+    def write(self, vals):
+        # The partner carries the gender counted by the headcount rollup
+        if not {"state", "class_id", "partner_id"}.intersection(vals):
+            return super().write(vals)
+
+        if "class_id" in vals:
+            self._schedule_class_totals_refresh()
+        deltas = self._get_class_seat_deltas(-1)
+        rollup_deltas = self._get_rollup_deltas(-1)
+        result = super().write(vals)
+        self._update_class_seats(self._get_class_seat_deltas(1, deltas))
+        self.env["education.enrollment.rollup"]._apply_student_deltas(
+            self._get_rollup_deltas(1, rollup_deltas)
+        )
+        if "class_id" in vals:
+            self._schedule_class_totals_refresh()
+        return result
+
+    def unlink(self):
+        deltas = self._get_class_seat_deltas(-1)
+        rollup_deltas = self._get_rollup_deltas(-1)
+        self._schedule_class_totals_refresh()
+        result = super().unlink()
+        self._update_class_seats(deltas)
+        self.env["education.enrollment.rollup"]._apply_student_deltas(rollup_deltas)
+        return result
+
+    def _schedule_class_totals_refresh(self):
+        """Queue the headcount totals of the classes of these students and of
+        their departments, schools and years"""
+        self.class_id._schedule_totals_refresh()
+        self.class_id._schedule_parent_totals_refresh()
+
+    # Fee Methods
+    @api.model
+    def _schedule_fee_refresh(self, student_ids=(), move_ids=()):
+        """Queue a fee refresh for the given students, or for the students
+        invoiced by the given moves; the refresh runs once, before commit"""
+        data = self.env.cr.precommit.data
+        pending = data.get(self._FEE_REFRESH_KEY)
+        if pending is None:
+            pending = data[self._FEE_REFRESH_KEY] = {
+                "student_ids": set(),
+                "move_ids": set(),
+            }
+            self.env.cr.precommit.add(self._run_fee_refresh)
+        pending["student_ids"].update(student_ids)
+        pending["move_ids"].update(move_ids)
+
+    @api.model
+    def _run_fee_refresh(self):
+        pending = self.env.cr.precommit.data.pop(self._FEE_REFRESH_KEY, None)
+        if not pending:
+            return
+        student_ids = set(pending["student_ids"])
+        if pending["move_ids"]:
+            self.env["education.enrollment"].flush_model(["student_id", "invoice_id"])
+            self.env.cr.execute(
+                """
+                SELECT DISTINCT student_id
+                  FROM education_enrollment
+                 WHERE invoice_id = ANY(%s)
+                """,
+                [list(pending["move_ids"])],
+            )
+            student_ids.update(row[0] for row in self.env.cr.fetchall())
+        self.browse(student_ids).exists()._refresh_fee_totals()
+
+    def _refresh_fee_totals(self):
+        """Recompute total and outstanding fees of these students with one
+        grouped query; an invoice shared by several enrollments counts once"""
+        if not self:
+            return
+        self.env["education.enrollment"].flush_model(["student_id", "invoice_id"])
+        self.env["account.move"].flush_model(
+            ["move_type", "amount_total", "payment_state"]
+        )
+        self.env.cr.execute(
+            """
+            UPDATE education_student student
+               SET total_fees = COALESCE(fees.total, 0),
+                   outstanding_fees = COALESCE(fees.outstanding, 0)
+              FROM unnest(%(ids)s::int[]) AS target(id)
+         LEFT JOIN (
+                    SELECT inv.student_id,
+                           SUM(inv.amount_total) AS total,
+                           SUM(inv.amount_total) FILTER (
+                               WHERE inv.payment_state IS DISTINCT FROM 'paid'
+                           ) AS outstanding
+                      FROM (
+                            SELECT DISTINCT e.student_id, m.id,
+                                   m.amount_total, m.payment_state
+                              FROM education_enrollment e
+                              JOIN account_move m ON m.id = e.invoice_id
+                             WHERE e.student_id = ANY(%(ids)s)
+                               AND m.move_type = 'out_invoice'
+                           ) inv
+                  GROUP BY inv.student_id
+                   ) fees ON fees.student_id = target.id
+             WHERE student.id = target.id
+            """,
+            {"ids": self.ids},
+        )
+        self.invalidate_recordset(["total_fees", "outstanding_fees"])
+
+    # Seat Methods
+    def _get_class_seat_deltas(self, sign, deltas=None):
+        """Add the class seats held by these students, times ``sign``, to
+        ``{class_id: seats}``"""
+        deltas = defaultdict(int) if deltas is None else deltas
+        for student in self:
+            if student.state in self._SEAT_STATES and student.class_id:
+                deltas[student.class_id.id] += sign
+        return deltas
+
+    def _get_rollup_deltas(self, sign, deltas=None):
+        """Add these students, times ``sign``, to
+        ``{(class_id, state, gender): n}``"""
+        deltas = defaultdict(int) if deltas is None else deltas
+        for student in self:
+            if student.class_id and student.state:
+                deltas[
+                    student.class_id.id, student.state, student.gender or "unknown"
+                ] += sign
+        return deltas
+
+    def _update_class_seats(self, deltas):
+        """Reserve/release class seats; capacity is enforced atomically unless
+        the ``skip_capacity`` or ``skip_validation`` context flag is set"""
+        self.env["education.class"]._apply_seat_deltas(
+            deltas,
+            force=self.env.context.get("skip_capacity")
+            or self.env.context.get("skip_validation"),
+        )
 
+    # Student ID Allocation
+    @api.private
     def _generate_student_id(self, vals):
-        """Generate unique student ID"""
-        sequence = self.env["ir.sequence"].next_by_code("education.student") or "0001"
-        school_code = "STU"
+        """Generate a unique student ID (private, not callable via RPC)."""
+        vals = dict(vals)
+        self._assign_student_ids([vals])
+        return vals["student_id"]
 
-        # Use school code from context if available
-        if self.env.context.get("school_id"):
-            school = self.env["education.school"].browse(self.env.context["school_id"])
-            school_code = school.code or "STU"
+    @api.model
+    def _assign_student_ids(self, vals_list):
+        """Fill in the missing ``student_id`` of ``vals_list``, allocating one
+        block of numbers per school"""
+        missing = [vals for vals in vals_list if not vals.get("student_id")]
+        if not missing:
+            return
+
+        # Use school code from context if available, else the class school
+        context_school = self.env["education.school"].browse(
+            self.env.context.get("school_id")
+        )
+        classes = self.env["education.class"].browse(
+            {vals["class_id"] for vals in missing if vals.get("class_id")}
+        )
+        class_schools = {
+            school_class.id: school_class.department_id.school_id
+            for school_class in classes
+        }
+        by_school = defaultdict(list)
+        for vals in missing:
+            school = context_school or class_schools.get(
+                vals.get("class_id"), context_school
+            )
+            by_school[school].append(vals)
 
-        return f"{school_code}{sequence}"
+        for school, school_vals in by_school.items():
+            student_ids = self._allocate_student_ids(len(school_vals), school)
+            for vals, student_id in zip(school_vals, student_ids):
+                vals["student_id"] = student_id
+
+    @api.model
+    def _allocate_student_ids(self, count, school=None):
+        """Reserve a contiguous block of ``count`` student IDs.
+
+        The counter row (the sequence, or its current date range) is locked
+        for the rest of the transaction, so concurrent batches never
+        interleave. A no-gap counter is advanced by the whole block with one
+        UPDATE; a standard one draws the block from its PostgreSQL sequence
+        with one ``nextval`` over ``generate_series``. IDs are formatted like
+        ``ir.sequence`` does, the school code, when known, replacing the
+        sequence prefix.
+        """
+        if count <= 0:
+            return []
+        sequence = (
+            self.env["ir.sequence"]
+            .sudo()
+            .search(
+                [
+                    ("code", "=", "education.student"),
+                    ("company_id", "in", [self.env.company.id, False]),
+                ],
+                order="company_id",
+                limit=1,
+            )
+        )
+        if not sequence:
+            raise UserError(_("The student ID sequence is missing."))
+        counter = sequence._get_current_sequence()
+        if counter != sequence:
+            sequence = sequence.with_context(
+                ir_sequence_date_range=counter.date_from,
+                ir_sequence_date_range_end=counter.date_to,
+            )
+
+        block = sequence.number_increment * count
+        counter.flush_recordset(["number_next"])
+        if sequence.implementation == "no_gap":
+            self.env.cr.execute(
+                SQL(
+                    """
+                    UPDATE %s
+                       SET number_next = number_next + %s
+                     WHERE id = %s
+                 RETURNING number_next - %s
+                    """,
+                    SQL.identifier(counter._table),
+                    block,
+                    counter.id,
+                    block,
+                )
+            )
+            first = self.env.cr.fetchone()[0]
+            numbers = range(first, first + block, sequence.number_increment)
+            counter.invalidate_recordset(["number_next"])
+        else:
+            self.env.cr.execute(
+                SQL(
+                    "SELECT id FROM %s WHERE id = %s FOR UPDATE",
+                    SQL.identifier(counter._table),
+                    counter.id,
+                )
+            )
+            if counter == sequence:
+                pg_sequence = "ir_sequence_%03d" % sequence.id
+            else:
+                pg_sequence = "ir_sequence_%03d_%03d" % (sequence.id, counter.id)
+            self.env.cr.execute(
+                SQL(
+                    "SELECT nextval(%s) FROM generate_series(1, %s)",
+                    pg_sequence,
+                    count,
+                )
+            )
+            numbers = sorted(row[0] for row in self.env.cr.fetchall())
+
+        student_ids = [sequence.get_next_char(number) for number in numbers]
+        if school and school.code:
+            prefix = sequence._get_prefix_suffix()[0]
+            student_ids = [
+                school.code + student_id[len(prefix) :] for student_id in student_ids
+            ]
+        return student_ids
 
     # Python Constraints
     @api.constrains("enrollment_date", "graduation_date")
@@ -534,15 +892,10 @@ class EducationStudent(models.Model):
             if student.state != "draft":
                 raise UserError(_("You can only delete students in draft state."))
 
-    @api.private
-    def _generate_student_id(self, vals):
-        """Generate a unique student ID (private, not callable via RPC)."""
-        return "STU-%s" % self.env["ir.sequence"].next_by_code("education.student")
-
     def button_generate_student_id(self):
         """Public method to call the private generator, callable from UI button."""
         self.ensure_one()
-        student_id = self._generate_student_id({})
+        student_id = self._generate_student_id({"class_id": self.class_id.id})
         self.student_id = student_id
         return {
             "type": "ir.actions.client",
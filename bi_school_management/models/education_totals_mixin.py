@@ -0,0 +1,51 @@
+from odoo import models
+
+
+class EducationTotalsMixin(models.AbstractModel):
+    """Stored headcount totals refreshed with COUNT queries.
+
+    Changes only queue the affected records; the refresh runs once per
+    transaction, right before commit, whatever the number of changes, or
+    earlier when the totals are read or searched on in the meantime.
+
+    Inheriting models list the stored fields they maintain in
+    ``_totals_fields`` and define ``_refresh_totals``, which recomputes
+    those fields for ``self`` (all records when empty) in SQL.
+    """
+
+    _name = "education.totals.mixin"
+    _description = "Education Deferred Totals"
+
+    _totals_fields = ()
+
+    def init(self):
+        # Backfill totals of records created before they were maintained
+        if self._abstract:
+            return
+        self.browse()._refresh_totals()
+
+    def flush_model(self, fnames=None):
+        # Reads and searches flush the fields they use first; refresh the
+        # queued totals then, so they are never seen stale before commit
+        if fnames is None or set(fnames).intersection(self._totals_fields):
+            self._run_totals_refresh()
+        return super().flush_model(fnames)
+
+    def _schedule_totals_refresh(self):
+        """Queue these records for a totals refresh before commit"""
+        ids = [record_id for record_id in self.ids if record_id]
+        if not ids:
+            return
+        key = f"{self._name}.totals_refresh"
+        data = self.env.cr.precommit.data
+        if key not in data:
+            data[key] = set()
+            self.env.cr.precommit.add(self.browse()._run_totals_refresh)
+        data[key].update(ids)
+        # Make the next read of these totals go through flush_model
+        self.browse(ids).invalidate_recordset(list(self._totals_fields), flush=False)
+
+    def _run_totals_refresh(self):
+        ids = self.env.cr.precommit.data.pop(f"{self._name}.totals_refresh", None)
+        if ids:
+            self.browse(ids).exists()._refresh_totals()
@@ -0,0 +1,12 @@
+from odoo import models
+
+
+class ProductTemplate(models.Model):
+    _inherit = "product.template"
+
+    def write(self, vals):
+        result = super().write(vals)
+        # Course income accounts are cached per company for enrollment invoicing
+        if "property_account_income_id" in vals:
+            self.env.registry.clear_cache()
+        return result
@@ -10,3 +10,20 @@ class ResPartner(models.Model):
     gender = fields.Selection(
         [("male", "Male"), ("female", "Female"), ("other", "Other")], string="Gender"
     )
+
+    def write(self, vals):
+        if "gender" not in vals:
+            return super().write(vals)
+
+        # Move the students of these partners between headcount rollup rows
+        students = (
+            self.env["education.student"]
+            .sudo()
+            .search([("partner_id", "in", self.ids), ("class_id", "!=", False)])
+        )
+        deltas = students._get_rollup_deltas(-1)
+        result = super().write(vals)
+        self.env["education.enrollment.rollup"]._apply_student_deltas(
+            students._get_rollup_deltas(1, deltas)
+        )
+        return result
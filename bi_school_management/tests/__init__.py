@@ -0,0 +1,15 @@
+from . import (
+    test_attendance_archival,
+    test_attendance_bulk_mode,
+    test_attendance_counters,
+    test_attendance_daily,
+    test_attendance_percentage,
+    test_batch_enroll,
+    test_batch_graduate,
+    test_bulk_attendance_wizard,
+    test_deferred_totals,
+    test_invoice_jobs,
+    test_query_plans,
+    test_seat_concurrency,
+    test_student_ids,
+)
@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests.common import TransactionCase
+
+
+class EducationTestCommon(TransactionCase):
+    """Shared school/department/year/class fixtures for the module tests"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        cls.school = cls.env["education.school"].create(
+            {"name": "Test School", "code": "TST"}
+        )
+        cls.department = cls.env["education.department"].create(
+            {"name": "Science", "code": "SCI", "school_id": cls.school.id}
+        )
+        today = fields.Date.today()
+        cls.academic_year = cls.env["education.academic.year"].create(
+            {
+                "name": "Test Year",
+                "school_id": cls.school.id,
+                "start_date": today - timedelta(days=365),
+                "end_date": today + timedelta(days=30),
+            }
+        )
+        cls.school_class = cls.env["education.class"].create(
+            {
+                "name": "Class A",
+                "department_id": cls.department.id,
+                "academic_year_id": cls.academic_year.id,
+            }
+        )
+        cls.course = cls.env["education.course"].create(
+            {"name": "Physics", "department_id": cls.department.id}
+        )
+
+    @classmethod
+    def _create_students(cls, count, school_class=None):
+        partners = cls.env["res.partner"].create(
+            [{"name": f"Student {index}"} for index in range(count)]
+        )
+        return cls.env["education.student"].create(
+            [
+                {
+                    "partner_id": partner.id,
+                    "student_id": f"T{partner.id:06d}",
+                    "class_id": (school_class or cls.school_class).id,
+                }
+                for partner in partners
+            ]
+        )
+
+    @classmethod
+    def _create_attendance(cls, students, days, school_class=None):
+        """Create `days` attendance rows per student, one per past day"""
+        today = fields.Date.today()
+        states = ["present", "present", "absent", "late"]
+        return cls.env["education.attendance"].create(
+            [
+                {
+                    "student_id": student.id,
+                    "class_id": (school_class or cls.school_class).id,
+                    "date": today - timedelta(days=day + 1),
+                    "state": states[day % len(states)],
+                }
+                for student in students
+                for day in range(days)
+            ]
+        )
+
+    def _count_queries(self, func, *args, **kwargs):
+        """Run `func` and return how many SQL queries it issued"""
+        self.env.flush_all()
+        start = self.env.cr.sql_log_count
+        func(*args, **kwargs)
+        self.env.flush_all()
+        return self.env.cr.sql_log_count - start
@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+
+from .common import EducationTestCommon
+
+
+@tagged("post_install", "-at_install")
+class TestAttendanceArchival(EducationTestCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        students = cls._create_students(2)
+        cls.enrollments = cls.env["education.enrollment"].create(
+            [
+                {
+                    "student_id": student.id,
+                    "course_id": cls.course.id,
+                    "state": "enrolled",
+                }
+                for student in students
+            ]
+        )
+        today = fields.Date.today()
+        # Three old and two recent days per enrollment
+        cls.attendances = cls.env["education.attendance"].create(
+            [
+                {
+                    "student_id": enrollment.student_id.id,
+                    "enrollment_id": enrollment.id,
+                    "class_id": cls.school_class.id,
+                    "date": today - timedelta(days=days_ago),
+                    "state": "present" if days_ago % 2 else "absent",
+                }
+                for enrollment in cls.enrollments
+                for days_ago in (100, 101, 102, 1, 2)
+            ]
+        )
+        cls.old = cls.attendances.filtered(
+            lambda attendance: attendance.date < today - timedelta(days=90)
+        )
+
+    def _set_mode(self, mode):
+        self.env["ir.config_parameter"].sudo().set_param(
+            "bi_school_management.attendance_archive_mode", mode
+        )
+
+    def _run(self):
+        return self.env["education.attendance"]._run_attendance_archival(
+            batch_size=2, time_budget=60, auto_commit=False
+        )
+
+    def _daily_rows(self):
+        Daily = self.env["education.attendance.daily"]
+        Daily.invalidate_model()
+        return sorted(
+            Daily.search([]).mapped(
+                lambda row: (
+                    row.class_id.id,
+                    row.date,
+                    row.present_count,
+                    row.absent_count,
+                    row.total_count,
+                )
+            )
+        )
+
+    def _assert_counters_consistent(self):
+        self.assertEqual(self.enrollments._rebuild_attendance_stats(dry_run=True), [])
+        self.assertEqual(self.enrollments.mapped("total_classes"), [2, 2])
+        maintained = self._daily_rows()
+        self.env["education.attendance.daily"]._rebuild()
+        self.assertEqual(self._daily_rows(), maintained)
+        self.assertEqual(len(maintained), 2)
+
+    def test_archive_mode(self):
+        self._set_mode("archive")
+        result = self._run()
+
+        self.assertTrue(result["finished"])
+        self.assertEqual(result["processed"], len(self.old))
+        self.old.invalidate_recordset()
+        self.assertFalse(any(self.old.mapped("active")))
+        self.assertEqual(self.old.exists(), self.old)
+        self._assert_counters_consistent()
+
+    def test_move_mode(self):
+        self._set_mode("move")
+        old_ids = self.old.ids
+        result = self._run()
+
+        self.assertTrue(result["finished"])
+        self.assertEqual(result["processed"], len(old_ids))
+        self.assertFalse(self.old.exists())
+        archived = self.env["education.attendance.archive"].search(
+            [("attendance_id", "in", old_ids)]
+        )
+        self.assertEqual(sorted(archived.mapped("attendance_id")), sorted(old_ids))
+        self.assertEqual(set(archived.mapped("enrollment_id")), set(self.enrollments))
+        self._assert_counters_consistent()
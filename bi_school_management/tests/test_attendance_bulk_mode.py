@@ -0,0 +1,36 @@
+from odoo.tests import tagged
+
+from .common import EducationTestCommon
+
+
+@tagged("post_install", "-at_install")
+class TestAttendanceBulkMode(EducationTestCommon):
+    def _vals_list(self, students):
+        return [
+            {"student_id": student.id, "class_id": self.school_class.id}
+            for student in students
+        ]
+
+    def test_bulk_create_posts_one_summary(self):
+        students = self._create_students(5)
+        messages_before = len(self.school_class.message_ids)
+        attendances = self.env["education.attendance"]._create_bulk(
+            self._vals_list(students)
+        )
+        self.assertEqual(len(attendances), 5)
+        self.assertEqual(len(self.school_class.message_ids), messages_before + 1)
+        self.assertFalse(attendances.message_ids)
+
+    def test_per_row_cost_with_and_without_tracking(self):
+        """Benchmark: per-row query cost of tracked vs bulk creation"""
+        rows = 30
+        Attendance = self.env["education.attendance"].with_context(
+            tracking_disable=False
+        )
+        tracked_queries = self._count_queries(
+            Attendance.create, self._vals_list(self._create_students(rows))
+        )
+        bulk_queries = self._count_queries(
+            Attendance._create_bulk, self._vals_list(self._create_students(rows))
+        )
+        self.assertLess(bulk_queries / rows, tracked_queries / rows)
@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+
+from .common import EducationTestCommon
+
+
+@tagged("post_install", "-at_install")
+class TestAttendanceCounters(EducationTestCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.students = cls._create_students(3)
+        cls.enrollments = cls.env["education.enrollment"].create(
+            [
+                {
+                    "student_id": student.id,
+                    "course_id": cls.course.id,
+                    "state": "enrolled",
+                }
+                for student in cls.students
+            ]
+        )
+        today = fields.Date.today()
+        cls.env["education.attendance"].create(
+            [
+                {
+                    "student_id": enrollment.student_id.id,
+                    "enrollment_id": enrollment.id,
+                    "class_id": cls.school_class.id,
+                    "date": today - timedelta(days=day + 1),
+                    "state": "present" if day % 2 else "absent",
+                }
+                for enrollment in cls.enrollments
+                for day in range(4)
+            ]
+        )
+
+    def _corrupt(self, enrollments):
+        self.env.flush_all()
+        self.env.cr.execute(
+            """
+            UPDATE education_enrollment
+               SET total_classes = 99, attended_classes = 0
+             WHERE id = ANY(%s)
+            """,
+            (enrollments.ids,),
+        )
+        enrollments.invalidate_recordset()
+
+    def _counters(self, enrollments):
+        return [
+            (enrollment.total_classes, enrollment.attended_classes)
+            for enrollment in enrollments
+        ]
+
+    def test_counters_follow_attendance(self):
+        self.assertEqual(self._counters(self.enrollments), [(4, 2)] * 3)
+        self.assertEqual(self.enrollments._rebuild_attendance_stats(), [])
+
+    def test_dry_run_reports_without_repairing(self):
+        drifted = self.enrollments[:2]
+        self._corrupt(drifted)
+
+        drifted_ids = self.enrollments._rebuild_attendance_stats(dry_run=True)
+
+        self.assertEqual(sorted(drifted_ids), sorted(drifted.ids))
+        self.enrollments.invalidate_recordset()
+        self.assertEqual(self._counters(self.enrollments), [(99, 0), (99, 0), (4, 2)])
+
+    def test_repair_fixes_drift_in_batches(self):
+        drifted = self.enrollments[0] | self.enrollments[2]
+        self._corrupt(drifted)
+
+        drifted_ids = self.enrollments._rebuild_attendance_stats(batch_size=1)
+
+        self.assertEqual(sorted(drifted_ids), sorted(drifted.ids))
+        self.assertEqual(self._counters(self.enrollments), [(4, 2)] * 3)
+        self.assertAlmostEqual(self.enrollments[0].attendance_percentage, 50.0)
+        self.assertEqual(self.enrollments._rebuild_attendance_stats(), [])
+
+    def test_repair_issues_one_update_per_batch(self):
+        self._corrupt(self.enrollments)
+        queries = self._count_queries(
+            self.enrollments._rebuild_attendance_stats, batch_size=1000
+        )
+        self._corrupt(self.enrollments[:1])
+        single_queries = self._count_queries(
+            self.enrollments._rebuild_attendance_stats, batch_size=1000
+        )
+        self.assertEqual(queries, single_queries)
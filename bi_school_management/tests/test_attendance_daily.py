@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+
+from .common import EducationTestCommon
+
+
+@tagged("post_install", "-at_install")
+class TestAttendanceDaily(EducationTestCommon):
+    def test_group_rate_is_weighted(self):
+        small_class = self.env["education.class"].create(
+            {
+                "name": "Class S",
+                "department_id": self.department.id,
+                "academic_year_id": self.academic_year.id,
+            }
+        )
+        day = fields.Date.today() - timedelta(days=1)
+        small = self._create_students(1, small_class)
+        large = self._create_students(3)
+        self.env["education.attendance"].create(
+            [
+                {
+                    "student_id": student.id,
+                    "class_id": student.class_id.id,
+                    "date": day,
+                    "state": "present" if student in small else "absent",
+                }
+                for student in small | large
+            ]
+        )
+
+        groups = self.env["education.attendance.daily"].read_group(
+            [("date", "=", day)],
+            ["attendance_rate:avg"],
+            ["date:day"],
+        )
+        # 1 present out of 4, not the mean of 100% and 0%
+        self.assertAlmostEqual(groups[0]["attendance_rate"], 25.0)
@@ -0,0 +1,29 @@
+from odoo.tests import tagged
+
+from .common import EducationTestCommon
+
+
+@tagged("post_install", "-at_install")
+class TestAttendancePercentage(EducationTestCommon):
+    def test_percentage_values(self):
+        students = self._create_students(2)
+        self._create_attendance(students[0], 8)
+        students._compute_attendance_percentage()
+        # 2 of every 4 days are "present"
+        self.assertAlmostEqual(students[0].attendance_percentage, 50.0)
+        self.assertEqual(students[1].attendance_percentage, 0.0)
+
+    def test_recompute_scales_with_students_not_rows(self):
+        """Benchmark: the query count of a batch recompute is independent of
+        how many attendance rows each student has"""
+        few_rows = self._create_students(10)
+        self._create_attendance(few_rows, 2)
+        many_rows = self._create_students(10)
+        self._create_attendance(many_rows, 60)
+
+        few_rows.invalidate_recordset()
+        few_queries = self._count_queries(few_rows._compute_attendance_percentage)
+        many_rows.invalidate_recordset()
+        many_queries = self._count_queries(many_rows._compute_attendance_percentage)
+
+        self.assertEqual(few_queries, many_queries)
@@ -0,0 +1,65 @@
+from odoo.tests import tagged
+
+from .common import EducationTestCommon
+
+
+@tagged("post_install", "-at_install")
+class TestBatchEnroll(EducationTestCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        user = cls.env["res.users"].create(
+            {"name": "Batch Teacher", "login": "batch_enroll_teacher"}
+        )
+        cls.teacher = cls.env["hr.employee"].create(
+            {"name": "Batch Teacher", "user_id": user.id}
+        )
+        cls.school_class.write({"capacity": 2, "teacher_id": cls.teacher.id})
+        cls.open_class = cls.env["education.class"].create(
+            {
+                "name": "Class Open",
+                "department_id": cls.department.id,
+                "academic_year_id": cls.academic_year.id,
+                "teacher_id": cls.teacher.id,
+            }
+        )
+
+    def _class_activities(self, school_class):
+        return self.env["mail.activity"].search(
+            [("res_model", "=", "education.class"), ("res_id", "=", school_class.id)]
+        )
+
+    def test_partial_failures_are_reported(self):
+        full = self._create_students(3)
+        open_students = self._create_students(2, self.open_class)
+        already = self._create_students(1, self.open_class)
+        already.batch_enroll()
+        no_class = self._create_students(1)
+        no_class.class_id = False
+
+        students = full | open_students | already | no_class
+        report = students.batch_enroll()
+
+        # The class holds two seats: the first two students by id get them
+        self.assertEqual(sorted(report["done"]), sorted((full[:2] | open_students).ids))
+        self.assertEqual(set(report["failed"]), {full[2].id, already.id, no_class.id})
+        self.assertEqual(
+            report["failed"][full[2].id], self.school_class._seat_capacity_error()
+        )
+        self.assertEqual(
+            set(students.browse(report["done"]).mapped("state")), {"enrolled"}
+        )
+        self.assertEqual(full[2].state, "draft")
+        self.assertEqual(no_class.state, "draft")
+        self.assertEqual(self.school_class.seats_taken, 2)
+
+    def test_one_digest_activity_per_class(self):
+        before = len(self._class_activities(self.open_class))
+        students = self._create_students(2) | self._create_students(3, self.open_class)
+        students.batch_enroll()
+
+        activities = self._class_activities(self.school_class)
+        self.assertEqual(len(activities), 1)
+        self.assertEqual(activities.user_id, self.teacher.user_id)
+        self.assertIn("2", activities.summary)
+        self.assertEqual(len(self._class_activities(self.open_class)), before + 1)
@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+
+from .common import EducationTestCommon
+
+
+@tagged("post_install", "-at_install")
+class TestBatchGraduate(EducationTestCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.students = cls._create_students(3)
+        cls.students.batch_enroll()
+        cls.good, cls.poor, cls.other = cls.students
+        today = fields.Date.today()
+        cls.env["education.attendance"].create(
+            [
+                {
+                    "student_id": student.id,
+                    "class_id": cls.school_class.id,
+                    "date": today - timedelta(days=day + 1),
+                    "state": "present",
+                }
+                for student in (cls.good, cls.other)
+                for day in range(4)
+            ]
+        )
+        # Half present, below the 75% threshold
+        cls._create_attendance(cls.poor, 4)
+        cls.draft = cls._create_students(1)
+
+    def _wizard(self):
+        return self.env["education.graduation.wizard"].create(
+            {"academic_year_id": self.academic_year.id}
+        )
+
+    def test_batch_graduate_reports_failures(self):
+        report = (self.students | self.draft).batch_graduate()
+
+        self.assertEqual(sorted(report["done"]), sorted((self.good | self.other).ids))
+        self.assertEqual(set(report["failed"]), {self.poor.id, self.draft.id})
+        self.assertEqual((self.good | self.other).mapped("state"), ["graduated"] * 2)
+        self.assertTrue(self.good.graduation_date)
+        self.assertEqual(self.poor.state, "enrolled")
+
+    def test_dry_run_writes_nothing_and_matches_real_run(self):
+        wizard = self._wizard()
+        wizard.action_dry_run()
+
+        self.assertEqual(wizard.state, "preview")
+        self.assertEqual(wizard.line_ids.student_id, self.students)
+        self.assertEqual(set(self.students.mapped("state")), {"enrolled"})
+        self.assertFalse(any(self.students.mapped("graduation_date")))
+
+        dry_failures = {
+            line.student_id.id: line.reason
+            for line in wizard.line_ids
+            if not line.eligible
+        }
+        report = self.students.with_context(
+            **wizard._graduation_context()
+        ).batch_graduate()
+        self.assertEqual(report["failed"], dry_failures)
+        self.assertEqual(
+            sorted(report["done"]),
+            sorted(wizard.line_ids.filtered("eligible").student_id.ids),
+        )
+
+    def test_wizard_graduates_eligible_students(self):
+        wizard = self._wizard()
+        wizard.action_dry_run()
+        wizard.action_graduate()
+
+        self.assertEqual(self.good.state, "graduated")
+        self.assertEqual(self.other.state, "graduated")
+        self.assertEqual(self.poor.state, "enrolled")
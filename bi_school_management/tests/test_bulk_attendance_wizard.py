@@ -0,0 +1,49 @@
+from odoo.tests import tagged
+
+from .common import EducationTestCommon
+
+
+@tagged("post_install", "-at_install")
+class TestBulkAttendanceWizard(EducationTestCommon):
+    def _make_wizard(self, students):
+        self.env["education.enrollment"].create(
+            [
+                {
+                    "student_id": student.id,
+                    "course_id": self.course.id,
+                    "state": "enrolled",
+                }
+                for student in students
+            ]
+        )
+        return self.env["education.bulk.attendance.wizard"].create(
+            {
+                "class_id": self.school_class.id,
+                "course_id": self.course.id,
+                "attendance_line_ids": [
+                    (0, 0, {"student_id": student.id}) for student in students
+                ],
+            }
+        )
+
+    def test_enrollments_resolved(self):
+        students = self._create_students(3)
+        wizard = self._make_wizard(students)
+        vals_list = wizard._prepare_attendance_vals_list()
+        enrollments = self.env["education.enrollment"].search(
+            [("student_id", "in", students.ids)]
+        )
+        self.assertEqual(
+            {vals["enrollment_id"] for vals in vals_list}, set(enrollments.ids)
+        )
+
+    def test_query_count_independent_of_line_count(self):
+        small = self._make_wizard(self._create_students(5))
+        large = self._make_wizard(self._create_students(40))
+
+        self.env.invalidate_all()
+        small_queries = self._count_queries(small._prepare_attendance_vals_list)
+        self.env.invalidate_all()
+        large_queries = self._count_queries(large._prepare_attendance_vals_list)
+
+        self.assertEqual(small_queries, large_queries)
@@ -0,0 +1,43 @@
+from odoo.tests import tagged
+
+from .common import EducationTestCommon
+
+
+@tagged("post_install", "-at_install")
+class TestDeferredTotals(EducationTestCommon):
+    def test_totals_fresh_before_commit(self):
+        """Queued refreshes run when the totals are read, not only at commit"""
+        self.school_class.capacity = 10
+        self.assertEqual(self.school_class.total_students, 0)
+
+        self._create_students(3)
+
+        self.assertEqual(self.school_class.total_students, 3)
+        self.assertEqual(self.school_class.available_capacity, 7)
+        self.assertEqual(self.department.total_students, 3)
+        self.assertEqual(self.academic_year.total_students, 3)
+
+    def test_search_on_totals_refreshes_first(self):
+        self._create_students(2)
+        classes = self.env["education.class"].search(
+            [("id", "=", self.school_class.id), ("total_students", "=", 2)]
+        )
+        self.assertEqual(classes, self.school_class)
+
+    def test_refresh_runs_once_for_many_changes(self):
+        students = self._create_students(2)
+        other_class = self.env["education.class"].create(
+            {
+                "name": "Class B",
+                "department_id": self.department.id,
+                "academic_year_id": self.academic_year.id,
+            }
+        )
+        students.write({"class_id": other_class.id})
+        students[0].class_id = self.school_class
+
+        self.assertEqual(self.school_class.total_students, 1)
+        self.assertEqual(other_class.total_students, 1)
+        self.assertFalse(
+            self.env.cr.precommit.data.get("education.class.totals_refresh")
+        )
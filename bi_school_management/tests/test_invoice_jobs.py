@@ -0,0 +1,168 @@
+from datetime import timedelta
+
+from odoo import SUPERUSER_ID, api, fields
+from odoo.sql_db import db_connect
+from odoo.tests import tagged
+from odoo.tests.common import BaseCase, TransactionCase, get_db_name
+
+
+def _create_journal_and_accounts(env, code):
+    journal = env["account.journal"].create(
+        {"name": f"Job Test {code}", "code": code, "type": "general"}
+    )
+    accounts = env["account.account"].create(
+        [
+            {
+                "name": "Job Test Assets",
+                "code": f"{code}1",
+                "account_type": "asset_current",
+            },
+            {"name": "Job Test Income", "code": f"{code}2", "account_type": "income"},
+        ]
+    )
+    return journal, accounts
+
+
+@tagged("post_install", "-at_install")
+class TestInvoiceJobs(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.journal, cls.accounts = _create_journal_and_accounts(cls.env, "TJOB")
+        cls.Job = cls.env["education.invoice.job"]
+        cls.env["ir.config_parameter"].sudo().set_param(
+            "bi_school_management.invoice_job_max_attempts", 2
+        )
+
+    def _move(self, balanced=True):
+        """A draft entry; unbalanced ones (without lines) fail to post"""
+        lines = []
+        if balanced:
+            lines = [
+                (0, 0, {"account_id": self.accounts[0].id, "debit": 100.0}),
+                (0, 0, {"account_id": self.accounts[1].id, "credit": 100.0}),
+            ]
+        return self.env["account.move"].create(
+            {
+                "move_type": "entry",
+                "journal_id": self.journal.id,
+                "date": fields.Date.today(),
+                "line_ids": lines,
+            }
+        )
+
+    def _enqueue(self, moves):
+        """Queue ``moves`` as due jobs.
+
+        ``now()`` is frozen for the test transaction, so the default
+        ``next_attempt`` would only come due in a later one.
+        """
+        jobs = self.Job._enqueue(moves, "post_invoice")
+        self._make_due(jobs)
+        return jobs
+
+    def _make_due(self, jobs):
+        jobs.next_attempt = fields.Datetime.now() - timedelta(days=1)
+
+    def _process(self):
+        return self.Job._process_jobs(batch_size=10, time_budget=60, auto_commit=False)
+
+    def test_chunk_posts_and_isolates_failures(self):
+        good = self._move() | self._move()
+        bad = self._move(balanced=False)
+        jobs = self._enqueue(good | bad)
+
+        stats = self._process()
+
+        self.assertEqual(stats, {"done": 2, "retried": 1, "dead": 0})
+        self.assertEqual(good.mapped("state"), ["posted"] * 2)
+        self.assertEqual(bad.state, "draft")
+        good_jobs = jobs.filtered(lambda job: job.move_id in good)
+        self.assertEqual(good_jobs.mapped("state"), ["done"] * 2)
+        bad_job = jobs - good_jobs
+        self.assertEqual(bad_job.state, "pending")
+        self.assertEqual(bad_job.attempts, 1)
+        self.assertTrue(bad_job.last_error)
+
+    def test_retry_backoff_then_dead(self):
+        job = self._enqueue(self._move(balanced=False))
+        started = fields.Datetime.now()
+
+        self._process()
+        self.assertEqual((job.state, job.attempts), ("pending", 1))
+        self.assertGreaterEqual(job.next_attempt, started + timedelta(minutes=2))
+
+        # Not due yet: the next run leaves it alone
+        self.assertEqual(self._process(), {"done": 0, "retried": 0, "dead": 0})
+        self.assertEqual(job.attempts, 1)
+
+        self._make_due(job)
+        self.assertEqual(self._process(), {"done": 0, "retried": 0, "dead": 1})
+        self.assertEqual((job.state, job.attempts), ("dead", 2))
+
+        job.action_retry()
+        self.assertEqual((job.state, job.attempts), ("pending", 0))
+
+    def test_cancelled_entries_are_dead(self):
+        move = self._move()
+        job = self._enqueue(move)
+        move.button_cancel()
+
+        self.assertEqual(self._process(), {"done": 0, "retried": 0, "dead": 1})
+        self.assertEqual(job.state, "dead")
+
+
+@tagged("post_install", "-at_install")
+class TestInvoiceJobClaiming(BaseCase):
+    """Workers skip jobs another transaction has claimed.
+
+    Two real transactions are needed, so the fixture is committed and
+    removed again afterwards.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.db = db_connect(get_db_name())
+        with self.db.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            journal, accounts = _create_journal_and_accounts(env, "TJCL")
+            move = env["account.move"].create(
+                {"move_type": "entry", "journal_id": journal.id}
+            )
+            job = env["education.invoice.job"].create(
+                {"move_id": move.id, "job_type": "post_invoice"}
+            )
+            self.job_id = job.id
+            ids = (job.id, move.id, journal.id, accounts.ids)
+            cr.commit()
+        self.addCleanup(self._cleanup, *ids)
+
+    def _cleanup(self, job_id, move_id, journal_id, account_ids):
+        with self.db.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            env["education.invoice.job"].browse(job_id).unlink()
+            env["account.move"].browse(move_id).unlink()
+            env["account.journal"].browse(journal_id).unlink()
+            env["account.account"].browse(account_ids).unlink()
+            cr.commit()
+
+    def test_locked_jobs_are_skipped(self):
+        with self.db.cursor() as claiming, self.db.cursor() as worker:
+            claiming.execute(
+                "SELECT id FROM education_invoice_job WHERE id = %s FOR UPDATE",
+                (self.job_id,),
+            )
+            env = api.Environment(worker, SUPERUSER_ID, {})
+            stats = env["education.invoice.job"]._process_jobs(
+                batch_size=10, time_budget=10, auto_commit=False
+            )
+            worker.rollback()
+            claiming.rollback()
+
+        self.assertEqual(stats, {"done": 0, "retried": 0, "dead": 0})
+        with self.db.cursor() as cr:
+            cr.execute(
+                "SELECT state, attempts FROM education_invoice_job WHERE id = %s",
+                (self.job_id,),
+            )
+            self.assertEqual(cr.fetchone(), ("pending", 0))
@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+from odoo.tools import SQL
+
+from .common import EducationTestCommon
+
+
+@tagged("post_install", "-at_install")
+class TestQueryPlans(EducationTestCommon):
+    """Guard the attendance hot paths against falling back to seq scans"""
+
+    STUDENTS = 200
+    DAYS = 120
+    COURSES = 40
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.students = cls._create_students(cls.STUDENTS)
+        cls.courses = cls.env["education.course"].create(
+            [
+                {"name": f"Course {index}", "department_id": cls.department.id}
+                for index in range(cls.COURSES)
+            ]
+        )
+        cls.today = fields.Date.today()
+        cls.env.flush_all()
+        # Synthetic dataset inserted in SQL: 24,000 attendance rows and 8,000
+        # enrollments, far too many for the planner to prefer a seq scan
+        cls.env.cr.execute(
+            """
+            INSERT INTO education_attendance (student_id, class_id, date, state, active)
+            SELECT s.id, %(class_id)s, %(today)s::date - d, 'present', true
+              FROM unnest(%(student_ids)s::int[]) AS s(id),
+                   generate_series(1, %(days)s) AS d
+            """,
+            {
+                "class_id": cls.school_class.id,
+                "today": cls.today,
+                "student_ids": cls.students.ids,
+                "days": cls.DAYS,
+            },
+        )
+        cls.env.cr.execute(
+            """
+            INSERT INTO education_enrollment
+                   (student_id, course_id, state, total_classes, attended_classes)
+            SELECT s.id, c.id, 'enrolled', 0, 0
+              FROM unnest(%s::int[]) AS s(id), unnest(%s::int[]) AS c(id)
+            """,
+            (cls.students.ids, cls.courses.ids),
+        )
+        cls.env.cr.execute("ANALYZE education_attendance")
+        cls.env.cr.execute("ANALYZE education_enrollment")
+
+    def _plan_nodes(self, plan):
+        yield plan
+        for child in plan.get("Plans", []):
+            yield from self._plan_nodes(child)
+
+    def assertNoSeqScan(self, model_name, domain, order=None):
+        model = self.env[model_name]
+        query = model._search(domain, order=order)
+        self.env.cr.execute(SQL("EXPLAIN (FORMAT JSON) %s", query.select()))
+        plan = self.env.cr.fetchone()[0][0]["Plan"]
+        seq_scans = [
+            node
+            for node in self._plan_nodes(plan)
+            if node["Node Type"] == "Seq Scan"
+            and node.get("Relation Name") == model._table
+        ]
+        self.assertFalse(
+            seq_scans, f"Sequential scan on {model._table} for {domain}: {plan}"
+        )
+
+    def test_attendance_by_class_and_date(self):
+        self.assertNoSeqScan(
+            "education.attendance",
+            [
+                ("class_id", "=", self.school_class.id),
+                ("date", "=", self.today - timedelta(days=3)),
+            ],
+        )
+
+    def test_attendance_by_student_before_date(self):
+        self.assertNoSeqScan(
+            "education.attendance",
+            [
+                ("student_id", "=", self.students[0].id),
+                ("date", "<", self.today - timedelta(days=60)),
+            ],
+            order="date desc",
+        )
+
+    def test_enrollment_by_student_course_state(self):
+        self.assertNoSeqScan(
+            "education.enrollment",
+            [
+                ("student_id", "in", self.students[:60].ids),
+                ("course_id", "=", self.courses[0].id),
+                ("state", "=", "enrolled"),
+            ],
+        )
+
+    def test_archival_candidates(self):
+        self.assertNoSeqScan(
+            "education.attendance",
+            [
+                ("date", "<", self.today - timedelta(days=self.DAYS - 2)),
+                ("active", "=", True),
+            ],
+            order="date, id",
+        )
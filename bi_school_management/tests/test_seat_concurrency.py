@@ -0,0 +1,96 @@
+import threading
+
+from psycopg2 import errors
+
+from odoo import SUPERUSER_ID, api
+from odoo.exceptions import ValidationError
+from odoo.sql_db import db_connect
+from odoo.tests import tagged
+from odoo.tests.common import BaseCase, get_db_name
+
+
+@tagged("post_install", "-at_install")
+class TestSeatConcurrency(BaseCase):
+    """Stress test seat reservation from parallel workers.
+
+    Each worker uses its own database connection and transaction, so the
+    fixture is committed for real and removed again afterwards.
+    """
+
+    CAPACITY = 5
+    WORKERS = 20
+    # Transactions losing a race on the counter row are retried afresh
+    MAX_TRIES = 10
+
+    def setUp(self):
+        super().setUp()
+        self.db = db_connect(get_db_name())
+        with self.db.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {"tracking_disable": True})
+            school = env["education.school"].create(
+                {"name": "Seat Stress School", "code": "SEAT-STRESS"}
+            )
+            department = env["education.department"].create(
+                {"name": "Seat Stress", "school_id": school.id}
+            )
+            course = env["education.course"].create(
+                {
+                    "name": "Seat Stress Course",
+                    "department_id": department.id,
+                    "capacity": self.CAPACITY,
+                }
+            )
+            self.course_id = course.id
+            ids = (school.id, department.id, course.id)
+            cr.commit()
+        self.addCleanup(self._cleanup, *ids)
+
+    def _cleanup(self, school_id, department_id, course_id):
+        with self.db.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {"tracking_disable": True})
+            env["education.course"].browse(course_id).unlink()
+            env["education.department"].browse(department_id).unlink()
+            env["education.school"].browse(school_id).unlink()
+            cr.commit()
+
+    def _worker(self, barrier, results):
+        barrier.wait()
+        for _try in range(self.MAX_TRIES):
+            with self.db.cursor() as cr:
+                env = api.Environment(cr, SUPERUSER_ID, {})
+                try:
+                    env["education.course"]._reserve_seats({self.course_id: 1})
+                    cr.commit()
+                except ValidationError:
+                    cr.rollback()
+                    results.append(False)
+                    return
+                except (errors.SerializationFailure, errors.DeadlockDetected):
+                    # REPEATABLE READ: the row changed under us, start over
+                    cr.rollback()
+                    continue
+                results.append(True)
+                return
+        results.append(False)
+
+    def test_parallel_reservations_never_oversubscribe(self):
+        barrier = threading.Barrier(self.WORKERS)
+        results = []
+        threads = [
+            threading.Thread(target=self._worker, args=(barrier, results))
+            for _index in range(self.WORKERS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=60)
+
+        self.assertEqual(len(results), self.WORKERS)
+        successes = results.count(True)
+        self.assertLessEqual(successes, self.CAPACITY)
+        with self.db.cursor() as cr:
+            cr.execute(
+                "SELECT seats_taken FROM education_course WHERE id = %s",
+                (self.course_id,),
+            )
+            self.assertEqual(cr.fetchone()[0], successes)
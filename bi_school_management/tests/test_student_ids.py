@@ -0,0 +1,53 @@
+from odoo.tests import tagged
+
+from .common import EducationTestCommon
+
+
+@tagged("post_install", "-at_install")
+class TestStudentIdAllocation(EducationTestCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.sequence = cls.env.ref("bi_school_management.seq_education_student")
+        cls.Student = cls.env["education.student"]
+
+    def _check_block(self, implementation):
+        self.sequence.write(
+            {"implementation": implementation, "prefix": "STU", "padding": 4}
+        )
+        student_ids = self.Student._allocate_student_ids(5)
+
+        self.assertEqual(len(set(student_ids)), 5)
+        for student_id in student_ids:
+            self.assertRegex(student_id, r"^STU\d{4}$")
+        numbers = [int(student_id[3:]) for student_id in student_ids]
+        # One contiguous block in ascending order, continued by the sequence
+        self.assertEqual(numbers, list(range(numbers[0], numbers[0] + 5)))
+        self.assertEqual(self.sequence._next(), f"STU{numbers[-1] + 1:04d}")
+
+    def test_standard_sequence_block(self):
+        self._check_block("standard")
+
+    def test_no_gap_sequence_block(self):
+        self._check_block("no_gap")
+
+    def test_school_code_replaces_prefix(self):
+        for implementation in ("standard", "no_gap"):
+            self.sequence.implementation = implementation
+            student_ids = self.Student._allocate_student_ids(2, self.school)
+            for student_id in student_ids:
+                self.assertRegex(student_id, r"^TST\d{4}$")
+
+    def test_batch_create_assigns_unique_ids(self):
+        partners = self.env["res.partner"].create(
+            [{"name": f"Batch {index}"} for index in range(4)]
+        )
+        students = self.Student.create(
+            [
+                {"partner_id": partner.id, "class_id": self.school_class.id}
+                for partner in partners
+            ]
+        )
+        student_ids = students.mapped("student_id")
+        self.assertEqual(len(set(student_ids)), 4)
+        self.assertTrue(all(student_id.startswith("TST") for student_id in student_ids))
@@ -3,5 +3,7 @@ from . import (
     bulk_attendance_wizard,
     course_enrollment_wizard,
     education_student_batch_create_wizard,
+    grade_sheet_wizard,
+    graduation_wizard,
     student_registration_wizard,
 )
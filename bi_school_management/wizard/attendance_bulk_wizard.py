@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from odoo import api, fields, models
 
 
@@ -21,16 +23,51 @@ class EducationAttendanceBulkWizard(models.TransientModel):
             self.attendance_line_ids = lines
 
     def action_mark_attendance(self):
+        """Create or update the roll for the class and date in batch.
+
+        Rows that already exist for the same student/class/date (archived ones
+        included) are updated in place, grouped by target state, and the rest
+        are created with a single multi-create. Resubmitting is idempotent.
+        """
+        self.ensure_one()
+        Attendance = self.env["education.attendance"].with_context(active_test=False)
+
+        states = {}
         for line in self.attendance_line_ids:
-            self.env["education.attendance"].create(
+            states[line.student_id.id] = line.state  # pylint: disable=no-member
+
+        existing = Attendance.search_fetch(
+            [
+                ("class_id", "=", self.class_id.id),
+                ("date", "=", self.date),
+                ("student_id", "in", list(states)),
+            ],
+            ["student_id", "state", "active"],
+        )
+
+        to_update = defaultdict(lambda: Attendance)
+        for attendance in existing:
+            state = states.pop(attendance.student_id.id)
+            if attendance.state != state or not attendance.active:
+                to_update[state] |= attendance
+        for state, attendances in to_update.items():
+            attendances._write_bulk({"state": state, "active": True})
+
+        created = Attendance._create_bulk(
+            [
                 {
-                    "student_id": line.student_id.id,  # pylint: disable=no-member
+                    "student_id": student_id,
                     "class_id": self.class_id.id,
                     "date": self.date,
-                    "state": line.state,  # pylint: disable=no-member
+                    "state": state,
                     "teacher_id": self.class_id.teacher_id.id,
                 }
-            )
+                for student_id, state in states.items()
+            ],
+            post_summary=False,
+        )
+        if created or to_update:
+            (existing | created)._post_bulk_summary()
         return {"type": "ir.actions.act_window_close"}
 
 
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from datetime import datetime, timedelta
 
 from odoo import _, api, fields, models
@@ -177,7 +178,8 @@ class BulkAttendanceWizard(models.TransientModel):
             # Check for existing attendance (context-dependent)
             if not self.env.context.get("allow_duplicate_attendance"):
                 existing = self.env["education.attendance"].search(
-                    [("class_id", "=", self.class_id.id), ("date", "=", self.date)]
+                    [("class_id", "=", self.class_id.id), ("date", "=", self.date)],
+                    limit=1,
                 )
                 if existing:
                     raise UserError(
@@ -247,16 +249,9 @@ class BulkAttendanceWizard(models.TransientModel):
         if not self.attendance_line_ids:
             raise UserError(_("No attendance data to process."))
 
-        # Create attendance records
-        attendance_records = []
-        for line in self.attendance_line_ids:
-            # Prepare attendance values with context
-            vals = self._prepare_attendance_vals(line)
-            attendance_records.append(vals)
-
         # Batch create attendance records
-        created_attendances = self.env["education.attendance"].create(
-            attendance_records
+        created_attendances = self.env["education.attendance"]._create_bulk(
+            self._prepare_attendance_vals_list()
         )
 
         # Post-processing based on context
@@ -272,8 +267,41 @@ class BulkAttendanceWizard(models.TransientModel):
 
         return self._return_success_action(created_attendances)
 
-    def _prepare_attendance_vals(self, line):
+    def _prepare_attendance_vals_list(self):
+        """Prepare values for every attendance line, resolving enrollments once"""
+        enrollment_map = self._get_enrollment_map()
+        return [
+            self._prepare_attendance_vals(line, enrollment_map)
+            for line in self.attendance_line_ids
+        ]
+
+    def _get_enrollment_map(self):
+        """Map student id to its active enrollment in the wizard course.
+
+        All lines are resolved with a single query instead of one search per
+        line.
+        """
+        if not self.course_id:
+            return {}
+
+        enrollments = self.env["education.enrollment"].search_fetch(
+            [
+                ("student_id", "in", self.attendance_line_ids.student_id.ids),
+                ("course_id", "=", self.course_id.id),
+                ("state", "=", "enrolled"),
+            ],
+            ["student_id"],
+        )
+        enrollment_map = {}
+        for enrollment in enrollments:
+            enrollment_map.setdefault(enrollment.student_id.id, enrollment.id)
+        return enrollment_map
+
+    def _prepare_attendance_vals(self, line, enrollment_map=None):
         """Prepare attendance record values - Context: Context-based configuration"""
+        if enrollment_map is None:
+            enrollment_map = self._get_enrollment_map()
+
         vals = {
             "student_id": line.student_id.id,
             "class_id": self.class_id.id,
@@ -284,17 +312,8 @@ class BulkAttendanceWizard(models.TransientModel):
         }
 
         # Add enrollment context if course is specified
-        if self.course_id:
-            enrollment = self.env["education.enrollment"].search(
-                [
-                    ("student_id", "=", line.student_id.id),
-                    ("course_id", "=", self.course_id.id),
-                    ("state", "=", "enrolled"),
-                ],
-                limit=1,
-            )
-            if enrollment:
-                vals["enrollment_id"] = enrollment.id
+        if line.student_id.id in enrollment_map:
+            vals["enrollment_id"] = enrollment_map[line.student_id.id]
 
         # Add time tracking if context specifies
         if self.env.context.get("track_time"):
@@ -339,11 +358,11 @@ class BulkAttendanceWizard(models.TransientModel):
                 )
 
     def _update_enrollment_statistics(self, attendances):
-        """Update enrollment attendance statistics"""
-        # This would update computed fields on enrollment records
-        enrollments = attendances.mapped("enrollment_id").filtered(lambda e: e)
-        for enrollment in enrollments:
-            enrollment._compute_attendance_stats()
+        """Update enrollment attendance statistics.
+
+        Creating ``attendances`` already applied their counter deltas to the
+        enrollments, so no recount is done here.
+        """
 
     def _return_wizard(self):
         """Return wizard action to continue in same window"""
@@ -460,23 +479,32 @@ class BulkAttendanceLine(models.TransientModel):
         string="Last Attendance", compute="_compute_last_attendance"
     )
 
-    @api.depends("student_id")
+    @api.depends("student_id", "wizard_id.date")
     def _compute_last_attendance(self):
-        """Compute last attendance for context display"""
+        """Compute last attendance for context display.
+
+        The most recent earlier attendance of every student is fetched with
+        one query per wizard date, walking the ``(student_id, date)`` index.
+        """
+        state_labels = dict(
+            self.env["education.attendance"]
+            ._fields["state"]
+            ._description_selection(self.env)
+        )
+        lines_by_date = defaultdict(lambda: self.browse())
         for line in self:
-            if line.student_id:
-                last_attendance = self.env["education.attendance"].search(
-                    [
-                        ("student_id", "=", line.student_id.id),
-                        ("date", "<", line.wizard_id.date),
-                    ],
-                    order="date desc",
-                    limit=1,
-                )
+            if line.student_id and line.wizard_id.date:
+                lines_by_date[line.wizard_id.date] |= line
+            else:
+                line.last_attendance = ""
 
-                if last_attendance:
-                    line.last_attendance = f"{last_attendance.date} - {dict(last_attendance._fields['state'].selection)[last_attendance.state]}"
+        for date, lines in lines_by_date.items():
+            last_by_student = self.env[
+                "education.attendance"
+            ]._get_last_attendance_before(lines.student_id.ids, date)
+            for line in lines:
+                last = last_by_student.get(line.student_id.id)
+                if last:
+                    line.last_attendance = f"{last[0]} - {state_labels[last[1]]}"
                 else:
                     line.last_attendance = _("No previous attendance")
-            else:
-                line.last_attendance = ""
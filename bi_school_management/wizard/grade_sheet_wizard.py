@@ -0,0 +1,209 @@
+import base64
+import csv
+import io
+from collections import defaultdict
+
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError
+
+from ..models.education_enrollment import GRADE_SELECTION
+
+
+class EducationGradeSheetWizard(models.TransientModel):
+    _name = "education.grade.sheet.wizard"
+    _description = "Education Grade Sheet Import"
+
+    course_id = fields.Many2one("education.course", string="Course", required=True)
+    sheet_file = fields.Binary(
+        string="Grade Sheet",
+        help="CSV file with a 'student_code' and a 'score' column",
+    )
+    sheet_filename = fields.Char(string="File Name")
+    complete_eligible = fields.Boolean(
+        string="Complete Eligible Enrollments",
+        default=True,
+        help="Complete enrolled students meeting the attendance requirement",
+    )
+    min_attendance_percentage = fields.Float(
+        string="Minimum Attendance %", default=75.0
+    )
+    state = fields.Selection(
+        [("upload", "Upload"), ("preview", "Preview")], default="upload"
+    )
+    line_ids = fields.One2many(
+        "education.grade.sheet.line", "wizard_id", string="Preview"
+    )
+    update_count = fields.Integer(compute="_compute_counts")
+    complete_count = fields.Integer(compute="_compute_counts")
+    error_count = fields.Integer(compute="_compute_counts")
+
+    @api.depends("line_ids.status")
+    def _compute_counts(self):
+        for wizard in self:
+            statuses = wizard.line_ids.mapped("status")
+            wizard.update_count = statuses.count("update")
+            wizard.complete_count = statuses.count("complete")
+            wizard.error_count = statuses.count("error")
+
+    def _read_sheet(self):
+        """Return the ``(student_code, raw score)`` rows of the sheet"""
+        if not self.sheet_file:
+            raise UserError(_("Please upload a grade sheet."))
+        try:
+            content = base64.b64decode(self.sheet_file).decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise UserError(
+                _("The grade sheet must be a UTF-8 encoded CSV file.")
+            ) from None
+        reader = csv.DictReader(io.StringIO(content))
+        if not {"student_code", "score"}.issubset(reader.fieldnames or ()):
+            raise UserError(
+                _("The grade sheet needs a 'student_code' and a 'score' column.")
+            )
+        return [
+            ((row["student_code"] or "").strip(), (row["score"] or "").strip())
+            for row in reader
+        ]
+
+    def action_preview(self):
+        """Map the sheet to enrollments and compute the new grades"""
+        self.ensure_one()
+        rows = self._read_sheet()
+
+        # One query maps every student code to its enrollment in the course
+        enrollments = self.env["education.enrollment"].search_fetch(
+            [
+                ("course_id", "=", self.course_id.id),
+                ("student_id.student_id", "in", [code for code, __ in rows]),
+            ],
+            ["student_id", "state", "score", "grade", "attendance_percentage"],
+        )
+        by_code = {
+            enrollment.student_id.student_id: enrollment for enrollment in enrollments
+        }
+
+        line_vals = []
+        scored = []
+        for code, raw_score in rows:
+            vals = {"wizard_id": self.id, "student_code": code, "status": "error"}
+            line_vals.append(vals)
+            enrollment = by_code.get(code)
+            if not enrollment:
+                vals["message"] = _("No enrollment in this course.")
+                continue
+            vals["enrollment_id"] = enrollment.id
+            try:
+                score = float(raw_score)
+            except ValueError:
+                vals["message"] = _("Invalid score '%s'.") % raw_score
+                continue
+            if not 0 <= score <= 100:
+                vals["message"] = _("Score must be between 0 and 100.")
+                continue
+            if enrollment.state in ("cancelled", "failed"):
+                vals["message"] = _("Cancelled or failed enrollments cannot be graded.")
+                continue
+            vals.update(score=score, status="update", message=False)
+            if (
+                self.complete_eligible
+                and enrollment.state == "enrolled"
+                and enrollment.attendance_percentage >= self.min_attendance_percentage
+            ):
+                vals["status"] = "complete"
+            scored.append(vals)
+
+        # Grade every score of the sheet with one band lookup
+        grades = self.env["education.grade.band"]._get_grades(
+            [vals["score"] for vals in scored]
+        )
+        for vals, grade in zip(scored, grades):
+            vals["grade"] = grade
+
+        self.line_ids.unlink()
+        self.env["education.grade.sheet.line"].create(line_vals)
+        self.state = "preview"
+        return self._reopen()
+
+    def action_back(self):
+        self.ensure_one()
+        self.line_ids.unlink()
+        self.state = "upload"
+        return self._reopen()
+
+    def action_apply(self):
+        """Write the previewed scores and grades, then complete the
+        eligible enrollments in one batch transition"""
+        self.ensure_one()
+        lines = self.line_ids.filtered(lambda line: line.status != "error")
+        if not lines:
+            raise UserError(_("There is nothing to import."))
+
+        # One write per distinct (score, grade)
+        groups = defaultdict(lambda: self.env["education.enrollment"])
+        for line in lines:
+            groups[line.score, line.grade] |= line.enrollment_id
+        for (score, grade), enrollments in groups.items():
+            enrollments.write({"score": score, "grade": grade})
+
+        report = {"done": [], "failed": {}}
+        to_complete = lines.filtered(
+            lambda line: line.status == "complete"
+        ).enrollment_id
+        if to_complete:
+            report = to_complete.with_context(
+                min_attendance_percentage=self.min_attendance_percentage
+            ).batch_transition("complete")
+
+        message = _(
+            "%(graded)s scores imported, %(completed)s enrollments completed."
+        ) % {
+            "graded": len(lines),
+            "completed": len(report["done"]),
+        }
+        if report["failed"]:
+            message += " " + _("%s enrollments could not be completed.") % len(
+                report["failed"]
+            )
+        self.course_id.message_post(body=message)
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("Grade Sheet Imported"),
+                "message": message,
+                "type": "warning" if report["failed"] else "success",
+                "next": {"type": "ir.actions.act_window_close"},
+            },
+        }
+
+    def _reopen(self):
+        return {
+            "type": "ir.actions.act_window",
+            "res_model": self._name,
+            "res_id": self.id,
+            "view_mode": "form",
+            "target": "new",
+        }
+
+
+class EducationGradeSheetLine(models.TransientModel):
+    _name = "education.grade.sheet.line"
+    _description = "Education Grade Sheet Line"
+
+    wizard_id = fields.Many2one(
+        "education.grade.sheet.wizard", required=True, ondelete="cascade"
+    )
+    student_code = fields.Char(string="Student Code")
+    enrollment_id = fields.Many2one("education.enrollment", string="Enrollment")
+    student_id = fields.Many2one(related="enrollment_id.student_id")
+    current_score = fields.Float(related="enrollment_id.score", string="Current Score")
+    current_grade = fields.Selection(
+        related="enrollment_id.grade", string="Current Grade"
+    )
+    score = fields.Float(string="New Score")
+    grade = fields.Selection(GRADE_SELECTION, string="New Grade")
+    status = fields.Selection(
+        [("update", "Update"), ("complete", "Update & Complete"), ("error", "Error")],
+        string="Status",
+    )
+    message = fields.Char(string="Message")
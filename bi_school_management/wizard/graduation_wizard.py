@@ -0,0 +1,129 @@
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError
+
+
+class EducationGraduationWizard(models.TransientModel):
+    _name = "education.graduation.wizard"
+    _description = "Education Batch Graduation"
+
+    academic_year_id = fields.Many2one(
+        "education.academic.year", string="Academic Year", required=True
+    )
+    class_ids = fields.Many2many(
+        "education.class",
+        string="Classes",
+        domain="[('academic_year_id', '=', academic_year_id)]",
+        help="Leave empty to graduate every class of the academic year",
+    )
+    min_attendance_percentage = fields.Float(
+        string="Minimum Attendance %", default=75.0
+    )
+    create_certificate = fields.Boolean(string="Create Certificates")
+    state = fields.Selection(
+        [("draft", "Draft"), ("preview", "Preview")], default="draft"
+    )
+    line_ids = fields.One2many(
+        "education.graduation.line", "wizard_id", string="Dry Run"
+    )
+    eligible_count = fields.Integer(compute="_compute_counts")
+    blocked_count = fields.Integer(compute="_compute_counts")
+
+    @api.depends("line_ids.eligible")
+    def _compute_counts(self):
+        for wizard in self:
+            wizard.eligible_count = len(wizard.line_ids.filtered("eligible"))
+            wizard.blocked_count = len(wizard.line_ids) - wizard.eligible_count
+
+    def _get_students(self):
+        domain = [
+            ("state", "=", "enrolled"),
+            ("academic_year_id", "=", self.academic_year_id.id),
+        ]
+        if self.class_ids:
+            domain.append(("class_id", "in", self.class_ids.ids))
+        return self.env["education.student"].search(domain)
+
+    def _graduation_context(self):
+        return {
+            "min_attendance_percentage": self.min_attendance_percentage,
+            "create_certificate": self.create_certificate,
+        }
+
+    def action_dry_run(self):
+        """Check every student of the cohort without graduating anyone"""
+        self.ensure_one()
+        students = self._get_students()
+        if not students:
+            raise UserError(_("No enrolled students found for this selection."))
+
+        failures = students.with_context(
+            **self._graduation_context()
+        )._get_graduation_failures()
+        self.line_ids.unlink()
+        self.env["education.graduation.line"].create(
+            [
+                {
+                    "wizard_id": self.id,
+                    "student_id": student.id,
+                    "eligible": student not in failures,
+                    "reason": failures.get(student, False),
+                }
+                for student in students
+            ]
+        )
+        self.state = "preview"
+        return self._reopen()
+
+    def action_back(self):
+        self.ensure_one()
+        self.line_ids.unlink()
+        self.state = "draft"
+        return self._reopen()
+
+    def action_graduate(self):
+        """Graduate the eligible students of the dry run"""
+        self.ensure_one()
+        students = self.line_ids.filtered("eligible").student_id
+        if not students:
+            raise UserError(_("No student is eligible for graduation."))
+
+        # Requirements are checked again, data may have changed since
+        report = students.with_context(**self._graduation_context()).batch_graduate()
+        message = _("%s students graduated.") % len(report["done"])
+        if report["failed"]:
+            message += " " + _("%s students no longer meet the requirements.") % len(
+                report["failed"]
+            )
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("Graduation"),
+                "message": message,
+                "type": "warning" if report["failed"] else "success",
+                "next": {"type": "ir.actions.act_window_close"},
+            },
+        }
+
+    def _reopen(self):
+        return {
+            "type": "ir.actions.act_window",
+            "res_model": self._name,
+            "res_id": self.id,
+            "view_mode": "form",
+            "target": "new",
+        }
+
+
+class EducationGraduationLine(models.TransientModel):
+    _name = "education.graduation.line"
+    _description = "Education Batch Graduation Line"
+
+    wizard_id = fields.Many2one(
+        "education.graduation.wizard", required=True, ondelete="cascade"
+    )
+    student_id = fields.Many2one("education.student", string="Student")
+    class_id = fields.Many2one(related="student_id.class_id")
+    attendance_percentage = fields.Float(related="student_id.attendance_percentage")
+    eligible = fields.Boolean(string="Eligible")
+    reason = fields.Char(string="Reason")